@@ -16,6 +16,7 @@ from entity_pool import EntityPool
 from test_definition_parser import TestDefinitionParser
 from file_generators import FileGeneratorFactory
 from template_processor import TemplateProcessor
+from template_functions import TemplateFunctions
 
 
 class PrecheckGenerator:
@@ -44,6 +45,10 @@ class PrecheckGenerator:
             base_dir = Path.cwd()
         self.base_dir = Path(base_dir)
         
+        # Shared by every sample so it is not rebuilt per sample; each
+        # evaluation swaps in its own components and drops earlier file caches
+        self.template_functions = TemplateFunctions(base_dir=str(self.base_dir))
+        
         if test_definitions_file:
             self.test_definitions = self.parser.parse_file(test_definitions_file)
         else:
@@ -306,11 +311,13 @@ class PrecheckGenerator:
                     else:
                         resolved_components.append(component)
             
-            # Create a new TemplateFunctions instance with the resolved components
-            from template_functions import TemplateFunctions
-            template_functions = TemplateFunctions(base_dir=str(self.base_dir), components=resolved_components)
+            # Evaluate with this sample's resolved components. Cached files are
+            # only revalidated by mtime and size, which misses a same-size
+            # rewrite within mtime granularity, so start from empty caches
+            self.template_functions.clear_caches()
+            self.template_functions.reset_components(resolved_components)
             
-            result = template_functions.evaluate_all_functions(processed_text)
+            result = self.template_functions.evaluate_all_functions(processed_text)
             
             return result
             
@@ -2,28 +2,109 @@
 Scorer module for the PICARD framework
 """
 import json
+import os
 import sys
 import argparse
+import contextlib
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Union, Callable
 from abc import ABC, abstractmethod
 
+# Optional faster JSON decoder (see requirements.txt); the stdlib json
+# module is used without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add src to path for imports
 sys.path.append(str(Path(__file__).parent))
 
+# Files every scorable test directory must contain
+REQUIRED_TEST_FILES = frozenset({'precheck.jsonl', 'responses.jsonl'})
+
+
+def _json_loads(line: str) -> Any:
+    """Parse one JSONL line with orjson when available, otherwise stdlib json."""
+    if orjson is not None:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # orjson rejects some input json accepts (NaN, Infinity); let
+            # json parse it or raise its own error
+            pass
+    return json.loads(line)
+
+
+def _score_directory_captured(scorer, test_dir: Path) -> Tuple[str, Optional[list], Optional[str]]:
+    """
+    Score one test directory in a worker process, capturing what it prints.
+    
+    Returns (printed output, results, error message); the parent prints the
+    output so directories are reported in order rather than interleaved.
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        try:
+            results = scorer.score_test_directory(test_dir)
+        except Exception as e:
+            return output.getvalue(), None, str(e)
+    return output.getvalue(), results, None
+
+
 class ScoringResult:
     """Represents the result of scoring a single question."""
     
+    # Fixed attribute set: no per-instance __dict__ for results created in bulk
+    __slots__ = ('question_id', 'sample_number', 'scoring_type', 'correct',
+                 'error_message', '_details', '_details_builder', '_timestamp_ns')
+    
     def __init__(self, question_id: int, sample_number: int, scoring_type: str, 
-                 correct: bool, error_message: str = None, details: Dict[str, Any] = None):
+                 correct: bool, error_message: str = None,
+                 details: Union[Dict[str, Any], Callable[[], Dict[str, Any]]] = None):
+        """
+        details may be a dict, or a zero-argument callable that builds it; a
+        callable is only invoked the first time details are read, so costly
+        diagnostics are skipped by callers that only look at correct.
+        """
         self.question_id = question_id
         self.sample_number = sample_number
-        self.scoring_type = scoring_type
+        self.scoring_type = sys.intern(scoring_type) if isinstance(scoring_type, str) else scoring_type
         self.correct = correct
         self.error_message = error_message
-        self.details = details or {}
-        self.timestamp = datetime.now().isoformat()
+        if callable(details):
+            self._details = None
+            self._details_builder = details
+        else:
+            self._details = details or {}
+            self._details_builder = None
+        # Capture the time cheaply; format it only when someone reads it
+        self._timestamp_ns = time.time_ns()
+    
+    @property
+    def details(self) -> Dict[str, Any]:
+        """Scoring details, built on first access when created lazily."""
+        if self._details_builder is not None:
+            self._details = self._details_builder() or {}
+            self._details_builder = None
+        return self._details
+    
+    def __getstate__(self):
+        # Builders may be closures, which cannot be pickled; ship built details
+        details = self.details
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['_details'] = details
+        state['_details_builder'] = None
+        return None, state
+    
+    @property
+    def timestamp(self) -> str:
+        """ISO 8601 local time at which this result was created."""
+        return datetime.fromtimestamp(self._timestamp_ns / 1e9).isoformat()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -118,21 +199,33 @@ class PicardScorer:
     
     def validate_test_directory(self, test_dir: Path) -> bool:
         """Check if test directory has required files."""
-        required_files = ['precheck.jsonl', 'responses.jsonl']
-        
-        for filename in required_files:
-            if not (test_dir / filename).exists():
-                return False
+        # One directory listing instead of a stat() per required file
+        try:
+            with os.scandir(test_dir) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            return False
         
-        return True
+        return REQUIRED_TEST_FILES.issubset(names)
     
     def load_precheck_file(self, precheck_file: str) -> List[Dict[str, Any]]:
         """Load precheck entries from JSONL file."""
         precheck_entries = []
         with open(precheck_file, 'r', encoding='utf-8') as f:
             for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                # Reject obvious non-JSON lines without raising a decode error
+                if line[0] not in '{[':
+                    print(f"Error parsing precheck line {line_num}: not a JSON value")
+                    continue
                 try:
-                    entry = json.loads(line.strip())
+                    entry = _json_loads(line)
+                    # Scoring types are a small fixed vocabulary used as dispatch keys
+                    scoring_type = entry.get('scoring_type') if isinstance(entry, dict) else None
+                    if isinstance(scoring_type, str):
+                        entry['scoring_type'] = sys.intern(scoring_type)
                     precheck_entries.append(entry)
                 except json.JSONDecodeError as e:
                     print(f"Error parsing precheck line {line_num}: {e}")
@@ -145,7 +238,7 @@ class PicardScorer:
         with open(responses_file, 'r', encoding='utf-8') as f:
             for line_num, line in enumerate(f, 1):
                 try:
-                    entry = json.loads(line.strip())
+                    entry = _json_loads(line.strip())
                     response_entries.append(entry)
                 except json.JSONDecodeError as e:
                     print(f"Error parsing response line {line_num}: {e}")
@@ -153,8 +246,13 @@ class PicardScorer:
         return response_entries
     
     def match_entries(self, precheck_entries: List[Dict[str, Any]], 
-                     response_entries: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
-        """Match precheck entries with corresponding response entries."""
+                     response_entries: List[Dict[str, Any]]
+                     ) -> List[Tuple[Tuple[int, int], Dict[str, Any], Dict[str, Any]]]:
+        """Match precheck entries with corresponding response entries.
+        
+        Returns (key, precheck, response) triples where key is the
+        (question_id, sample_number) tuple used for matching.
+        """
         # Create lookup for responses
         response_lookup = {}
         for response in response_entries:
@@ -162,37 +260,45 @@ class PicardScorer:
             response_lookup[key] = response
         
         # Match with precheck entries
-        matched_pairs = []
+        matched = []
         for precheck in precheck_entries:
             key = (precheck['question_id'], precheck['sample_number'])
-            if key in response_lookup:
-                matched_pairs.append((precheck, response_lookup[key]))
+            response = response_lookup.get(key)
+            if response is not None:
+                matched.append((key, precheck, response))
             else:
                 print(f"Warning: No response found for Question {key[0]}, Sample {key[1]}")
         
-        return matched_pairs
+        return matched
     
     def score_single_entry(self, precheck_entry: Dict[str, Any], 
-                          response_entry: Dict[str, Any]) -> ScoringResult:
-        """Score a single precheck/response pair."""
+                          response_entry: Dict[str, Any],
+                          key: Optional[Tuple[int, int]] = None) -> ScoringResult:
+        """Score a single precheck/response pair.
+        
+        key is the (question_id, sample_number) tuple from match_entries;
+        it is read from precheck_entry when not supplied.
+        """
         scoring_type = precheck_entry['scoring_type']
+        scorer = self.scoring_types.get(scoring_type)
         
-        if scoring_type not in self.scoring_types:
+        if scorer is None:
+            question_id, sample_number = key or (precheck_entry['question_id'], precheck_entry['sample_number'])
             return ScoringResult(
-                question_id=precheck_entry['question_id'],
-                sample_number=precheck_entry['sample_number'],
+                question_id=question_id,
+                sample_number=sample_number,
                 scoring_type=scoring_type,
                 correct=False,
                 error_message=f"Unknown scoring type: {scoring_type}"
             )
         
-        scorer = self.scoring_types[scoring_type]
         try:
             return scorer.score(precheck_entry, response_entry, self.test_artifacts_dir)
         except Exception as e:
+            question_id, sample_number = key or (precheck_entry['question_id'], precheck_entry['sample_number'])
             return ScoringResult(
-                question_id=precheck_entry['question_id'],
-                sample_number=precheck_entry['sample_number'],
+                question_id=question_id,
+                sample_number=sample_number,
                 scoring_type=scoring_type,
                 correct=False,
                 error_message=f"Scoring error: {str(e)}"
@@ -228,8 +334,8 @@ class PicardScorer:
         results = []
         correct_count = 0
         
-        for precheck, response in matched_pairs:
-            result = self.score_single_entry(precheck, response)
+        for key, precheck, response in matched_pairs:
+            result = self.score_single_entry(precheck, response, key)
             results.append(result)
             
             if result.correct:
@@ -256,8 +362,15 @@ class PicardScorer:
         
         return results
     
-    def score_all_tests(self) -> Dict[str, List[ScoringResult]]:
-        """Score all test directories."""
+    def score_all_tests(self, max_workers: int = 1) -> Dict[str, List[ScoringResult]]:
+        """Score all test directories.
+
+        Directories are scored one after another unless max_workers is above
+        1, in which case they are scored in that many worker processes. Each
+        worker's output is printed by this process in directory order.
+        Registered scoring types travel to the workers with the scorer, so
+        they must be picklable for parallel scoring.
+        """
         test_dirs = self.find_test_directories()
         
         if not test_dirs:
@@ -267,16 +380,40 @@ class PicardScorer:
         print(f"📊 Found {len(test_dirs)} test directories to score")
         print()
         
+        max_workers = min(max_workers, len(test_dirs))
+        
         all_results = {}
         
-        for test_dir in test_dirs:
-            try:
-                results = self.score_test_directory(test_dir)
-                all_results[test_dir.name] = results
-                print(f"✅ Completed scoring for {test_dir.name}")
-                print()
-            except Exception as e:
-                print(f"❌ Failed to score {test_dir.name}: {e}")
+        if max_workers <= 1:
+            for test_dir in test_dirs:
+                try:
+                    results = self.score_test_directory(test_dir)
+                    all_results[test_dir.name] = results
+                    print(f"✅ Completed scoring for {test_dir.name}")
+                    print()
+                except Exception as e:
+                    print(f"❌ Failed to score {test_dir.name}: {e}")
+                    print()
+            return all_results
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(test_dir, executor.submit(_score_directory_captured, self, test_dir))
+                       for test_dir in test_dirs]
+            
+            for test_dir, future in futures:
+                try:
+                    output, results, error = future.result()
+                except Exception as e:
+                    print(f"❌ Failed to score {test_dir.name}: {e}")
+                    print()
+                    continue
+                
+                print(output, end='')
+                if error is None:
+                    all_results[test_dir.name] = results
+                    print(f"✅ Completed scoring for {test_dir.name}")
+                else:
+                    print(f"❌ Failed to score {test_dir.name}: {error}")
                 print()
         
         return all_results
@@ -343,6 +480,7 @@ Examples:
   python scorer.py                                    # Score latest test
   python scorer.py --test-dir results/test_20250529   # Score specific test
   python scorer.py --all                             # Score all tests
+  python scorer.py --all --workers 4                 # Score all tests in 4 processes
   python scorer.py --list                            # List available tests
 '''
     )
@@ -364,6 +502,13 @@ Examples:
         help='List available test directories'
     )
     
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=1,
+        help='Number of processes to score directories with when using --all (default: 1)'
+    )
+    
     args = parser.parse_args()
     
     try:
@@ -382,7 +527,7 @@ Examples:
         
         if args.all:
             # Score all tests
-            all_results = scorer.score_all_tests()
+            all_results = scorer.score_all_tests(max_workers=args.workers)
             
             # Save results for each test
             for test_name, results in all_results.items():
@@ -4,6 +4,7 @@ JSON Match Scorer - Direct JSON response matching
 Compares JSON responses semantically rather than as strings,
 handling formatting differences, key ordering, and whitespace.
 """
+import functools
 import json
 import sys
 from pathlib import Path
@@ -85,7 +86,9 @@ class JsonMatchScorer(BaseScoringType):
         error_message = None
         if not correct:
             error_message = f"JSON structures do not match"
-            details['differences'] = self._find_json_differences(expected_json, actual_json)
+            # Diffing can be costly; only do it if someone reads the details
+            details = functools.partial(self._details_with_differences,
+                                        details, expected_json, actual_json)
         
         return ScoringResult(
             question_id=precheck_entry['question_id'],
@@ -96,6 +99,11 @@ class JsonMatchScorer(BaseScoringType):
             details=details
         )
     
+    def _details_with_differences(self, details, expected, actual):
+        """Add the list of JSON differences to a mismatch's details."""
+        details['differences'] = self._find_json_differences(expected, actual)
+        return details
+    
     def _deep_json_compare(self, expected, actual):
         """
         Deep comparison of JSON structures.
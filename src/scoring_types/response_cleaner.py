@@ -11,6 +11,26 @@ Supports multiple response formats:
 import re
 
 
+_HARMONY_MESSAGE_MARKER = '<|message|>'
+
+# Tag kinds are stripped one after another in this order, each pass working
+# on the previous pass's output, so with interleaved or nested tags of
+# different kinds the earlier kind's pairs are removed first
+_THINKING_TAG_NAMES = ('thinking', 'think', 'reasoning', 'thought', 'internal', 'reflection', 'analysis')
+
+# Patterns are compiled once at import; every scored response goes through them
+_THINKING_TAG_RES = tuple(
+    re.compile(f'<{name}>.*?</{name}>', re.IGNORECASE | re.DOTALL)
+    for name in _THINKING_TAG_NAMES
+)
+
+# Below this length the regex's lower fixed cost beats the find-based scanner
+_LINEAR_SCAN_MIN_LENGTH = 2048
+
+# Greedy prefix makes a single match end at the last </think> in the text
+_THROUGH_LAST_THINK_CLOSE_RE = re.compile(r'.*</think>', re.IGNORECASE | re.DOTALL)
+
+
 class ResponseCleaner:
     """Utility class for cleaning LLM responses before scoring."""
     
@@ -29,7 +49,7 @@ class ResponseCleaner:
             return False
             
         # Look for the characteristic Harmony format tokens
-        return '<|channel|>' in text and '<|message|>' in text
+        return '<|channel|>' in text and _HARMONY_MESSAGE_MARKER in text
     
     @staticmethod
     def strip_harmony_format(text):
@@ -51,22 +71,15 @@ class ResponseCleaner:
         if not text:
             return text
         
-        # Look for any message marker (regardless of channel)
-        message_pattern = r'<\|message\|>'
-        
-        # Find all matches to get the last one
-        matches = list(re.finditer(message_pattern, text))
+        # Look for the last message marker (regardless of channel)
+        last_marker = text.rfind(_HARMONY_MESSAGE_MARKER)
         
-        if not matches:
+        if last_marker < 0:
             # No message tags found, return original text
             return text
         
-        # Get the position after the last message marker
-        last_match = matches[-1]
-        final_answer_start = last_match.end()
-        
         # Extract everything after the last message marker
-        final_answer = text[final_answer_start:]
+        final_answer = text[last_marker + len(_HARMONY_MESSAGE_MARKER):]
         
         return final_answer
     
@@ -92,26 +105,59 @@ class ResponseCleaner:
         """
         if not text:
             return text
+        
+        # Every tag pair needs a closing '</'; a substring check is far
+        # cheaper than letting the regex scan text that cannot match
+        if '</' not in text:
+            return text
             
-        # Define patterns for common thinking tag formats
-        thinking_patterns = [
-            r'<thinking>.*?</thinking>',
-            r'<think>.*?</think>', 
-            r'<reasoning>.*?</reasoning>',
-            r'<thought>.*?</thought>',
-            r'<internal>.*?</internal>',
-            r'<reflection>.*?</reflection>',
-            r'<analysis>.*?</analysis>'
-        ]
-        
-        # Apply each pattern with case-insensitive matching and DOTALL flag
-        # DOTALL makes . match newlines too
+        if len(text) >= _LINEAR_SCAN_MIN_LENGTH and text.isascii():
+            return ResponseCleaner._strip_thinking_tags_ascii(text)
+        
+        # Apply each pattern (compiled case-insensitive with DOTALL,
+        # so . matches newlines too)
         cleaned_text = text
-        for pattern in thinking_patterns:
-            cleaned_text = re.sub(pattern, '', cleaned_text, flags=re.IGNORECASE | re.DOTALL)
+        for pattern in _THINKING_TAG_RES:
+            cleaned_text = pattern.sub('', cleaned_text)
         
         return cleaned_text
     
+    @staticmethod
+    def _strip_thinking_tags_ascii(text):
+        """
+        Remove thinking tag pairs from ASCII text with substring searches.
+        
+        Produces exactly what the _THINKING_TAG_RES passes do: for each kind in
+        turn, the leftmost opening tag is removed together with the first
+        closing tag after it, and scanning resumes after that closing tag.
+        Lowercasing ASCII preserves offsets, which is what makes searching a
+        lowered copy a valid case-insensitive match.
+        """
+        lowered = text.lower()
+        
+        for name in _THINKING_TAG_NAMES:
+            opening_tag = '<' + name + '>'
+            closing_tag = '</' + name + '>'
+            open_start = lowered.find(opening_tag)
+            pieces = []
+            keep_from = 0
+            
+            while open_start >= 0:
+                close_start = lowered.find(closing_tag, open_start + len(opening_tag))
+                if close_start < 0:
+                    # No later opening of this kind can find a closing tag either
+                    break
+                pieces.append(text[keep_from:open_start])
+                keep_from = close_start + len(closing_tag)
+                open_start = lowered.find(opening_tag, keep_from)
+            
+            if pieces:
+                pieces.append(text[keep_from:])
+                text = ''.join(pieces)
+                lowered = text.lower()
+        
+        return text
+    
     @staticmethod
     def strip_orphaned_think_closing(text):
         """
@@ -127,23 +173,18 @@ class ResponseCleaner:
         Returns:
             str: Text after the last </think> tag, or original text if no </think> found
         """
-        if not text:
+        if not text or '</' not in text:
             return text
             
-        # Find the last occurrence of </think> (case insensitive)
-        think_close_pattern = r'</think>'
-        matches = list(re.finditer(think_close_pattern, text, flags=re.IGNORECASE))
+        # Find the last occurrence of </think> (case insensitive) with one match
+        last_match = _THROUGH_LAST_THINK_CLOSE_RE.match(text)
         
-        if not matches:
+        if last_match is None:
             # No </think> tags found, return original text
             return text
         
-        # Get position after the last </think> tag
-        last_match = matches[-1]
-        after_think_start = last_match.end()
-        
         # Return everything after the last </think> tag
-        result = text[after_think_start:]
+        result = text[last_match.end():]
         
         return result
     
@@ -185,6 +226,35 @@ class ResponseCleaner:
             
         return cleaned
     
+    @staticmethod
+    def clean_response_with_flags(text):
+        """
+        Clean a response and report which formats it contained, in one pass.
+        
+        Equivalent to calling clean_response(text), has_thinking_tags(text) and
+        has_harmony_format(text), but the thinking-tag pattern is applied once
+        and its result shared between cleaning and detection.
+        
+        Args:
+            text (str): Raw LLM response text
+            
+        Returns:
+            tuple: (cleaned_text, thinking_tags_found, harmony_format_found)
+        """
+        if not text:
+            return text, False, False
+        
+        harmony_format_found = ResponseCleaner.has_harmony_format(text)
+        without_thinking = ResponseCleaner.strip_thinking_tags(text)
+        thinking_tags_found = len(without_thinking) != len(text)
+        
+        if harmony_format_found:
+            cleaned = ResponseCleaner.strip_harmony_format(text)
+        else:
+            cleaned = ResponseCleaner.strip_orphaned_think_closing(without_thinking)
+        
+        return cleaned.strip(), thinking_tags_found, harmony_format_found
+    
     @staticmethod
     def has_thinking_tags(text):
         """
@@ -199,7 +269,7 @@ class ResponseCleaner:
         Returns:
             bool: True if thinking tags are found
         """
-        if not text:
+        if not text or '</' not in text:
             return False
             
         original_length = len(text)
@@ -11,6 +11,10 @@ sys.path.append(str(Path(__file__).parent))
 from scorer import BaseScoringType, ScoringResult
 from response_cleaner import ResponseCleaner
 
+# Shared by every result this scorer produces
+_SCORING_TYPE = sys.intern('stringmatch')
+_COMPARISON_METHOD = sys.intern('exact_match_trimmed_cleaned')
+
 
 class StringMatchScorer(BaseScoringType):
     """Scorer for stringmatch scoring type - exact string comparison."""
@@ -20,8 +24,16 @@ class StringMatchScorer(BaseScoringType):
         expected_response = precheck_entry.get('expected_response', '').strip()
         raw_actual_response = response_entry.get('response_text', '')
         
-        # Clean the response using shared utility
-        cleaned_actual_response = ResponseCleaner.clean_response(raw_actual_response)
+        if isinstance(raw_actual_response, str) and '<' not in raw_actual_response:
+            # Fast path: without a '<' there are no thinking tags or Harmony
+            # markers, so cleaning reduces to trimming whitespace
+            cleaned_actual_response = raw_actual_response.strip()
+            thinking_tags_found = False
+            harmony_format_found = False
+        else:
+            # Clean the response and detect its format using shared utility
+            cleaned_actual_response, thinking_tags_found, harmony_format_found = \
+                ResponseCleaner.clean_response_with_flags(raw_actual_response)
         
         correct = expected_response == cleaned_actual_response
         
@@ -29,9 +41,9 @@ class StringMatchScorer(BaseScoringType):
             'expected': expected_response,
             'actual_raw': raw_actual_response,
             'actual_cleaned': cleaned_actual_response,
-            'comparison_method': 'exact_match_trimmed_cleaned',
-            'thinking_tags_found': ResponseCleaner.has_thinking_tags(raw_actual_response),
-            'harmony_format_found': ResponseCleaner.has_harmony_format(raw_actual_response)
+            'comparison_method': _COMPARISON_METHOD,
+            'thinking_tags_found': thinking_tags_found,
+            'harmony_format_found': harmony_format_found
         }
         
         error_message = None
@@ -41,7 +53,7 @@ class StringMatchScorer(BaseScoringType):
         return ScoringResult(
             question_id=precheck_entry['question_id'],
             sample_number=precheck_entry['sample_number'],
-            scoring_type='stringmatch',
+            scoring_type=_SCORING_TYPE,
             correct=correct,
             error_message=error_message,
             details=details
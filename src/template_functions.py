@@ -3,14 +3,31 @@ Template Functions for the PICARD framework
 
 Handles template function evaluation for file, CSV, SQLite, JSON, YAML and XML content extraction.
 """
+import codecs
 import csv
+import functools
+import io
 import json
+import mmap
+import operator
+import os
 import re
 import sqlite3
+import threading
 import yaml
 import xml.etree.ElementTree as ET
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import accumulate, islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# Optional faster JSON parser; the stdlib json module is used without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import ComponentSpec for type hints
 try:
@@ -20,10 +37,256 @@ except ImportError:
     ComponentSpec = None
 
 
+# Files at least this large have single lines read through a cached
+# line-offset index, and lines counted through mmap, instead of loading
+# (and caching) every line; below it a full read is cheap
+_MMAP_LINE_MIN_SIZE = 1024 * 1024
+_MMAP_CHUNK_SIZE = 1024 * 1024
+
+# Most recently used parsed files kept per cache (file, CSV, JSON) before
+# the least recently used one is dropped
+_FILE_CACHE_MAX_ENTRIES = 128
+
+# Most recently used derived results (resolved paths, per-column CSV values,
+# json_keys) kept per cache; derivations of a dropped file are dropped with it
+_DERIVED_CACHE_MAX_ENTRIES = 1024
+
+# Read tuning for cached SQLite connections: memory-map up to 16 MiB of
+# each database, let its page cache grow to 8 MiB, and keep more prepared
+# statements than sqlite3's default of 128. Kept modest because up to
+# _SQLITE_MAX_CONNECTIONS connections can be open at once
+_SQLITE_MMAP_SIZE = 16 * 1024 * 1024
+_SQLITE_CACHE_SIZE_KIB = 8 * 1024
+_SQLITE_CACHED_STATEMENTS = 256
+
+# Most recently used SQLite connections kept open per instance before the
+# least recently used one is closed
+_SQLITE_MAX_CONNECTIONS = 16
+
+# Setting PICARD_PARALLEL=1 evaluates the functions of one template on a
+# thread pool; file reads and sqlite queries release the GIL
+_PARALLEL_ENV_VAR = 'PICARD_PARALLEL'
+_PARALLEL_MAX_WORKERS = 8
+_parallel_executor = None
+_parallel_executor_lock = threading.Lock()
+
+
+def _get_parallel_executor() -> ThreadPoolExecutor:
+    """Return the shared thread pool for parallel evaluation, creating it on first use."""
+    global _parallel_executor
+    with _parallel_executor_lock:
+        if _parallel_executor is None:
+            _parallel_executor = ThreadPoolExecutor(max_workers=_PARALLEL_MAX_WORKERS,
+                                                    thread_name_prefix='picard-template')
+        return _parallel_executor
+
+
+# Pattern to match template functions: {{function_name:args}}
+_TEMPLATE_FUNCTION_RE = re.compile(r'\{\{([^:]+):([^}]+)\}\}')
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_template(text: str) -> tuple:
+    """
+    Parse the template function calls out of a template string.
+    
+    Templates are evaluated many times (once per sample, often with the same
+    text), so the parse is cached by the raw string. File paths such as
+    TARGET_FILE[name] stay unresolved here and are resolved per evaluation.
+    
+    Returns:
+        Tuple of (start, end, function_name, args_str, args) per call, in order
+    """
+    calls = []
+    for match in _TEMPLATE_FUNCTION_RE.finditer(text):
+        function_name = match.group(1).strip()
+        args_str = match.group(2).strip()
+        args = tuple(arg.strip() for arg in args_str.split(':'))
+        calls.append((match.start(), match.end(), function_name, args_str, args))
+    return tuple(calls)
+
+
+@functools.lru_cache(maxsize=512)
+def _split_key_path(key_path: str) -> tuple:
+    """Split a key path on dots outside brackets, e.g. 'a.b[0].c' -> ('a', 'b[0]', 'c')."""
+    parts = []
+    current_part = ""
+    bracket_depth = 0
+    
+    for char in key_path:
+        if char == '[':
+            bracket_depth += 1
+            current_part += char
+        elif char == ']':
+            bracket_depth -= 1
+            current_part += char
+        elif char == '.' and bracket_depth == 0:
+            if current_part:
+                parts.append(current_part)
+            current_part = ""
+        else:
+            current_part += char
+    
+    if current_part:
+        parts.append(current_part)
+    
+    return tuple(parts)
+
+
+@functools.lru_cache(maxsize=512)
+def _compile_key_path(key_path: str) -> tuple:
+    """
+    Compile a key path into (key, index) navigation steps.
+    
+    index is None for plain key access, an int for [N], or the raw bracket
+    text when it is not a valid integer (reported when the step is reached).
+    """
+    steps = []
+    for part in _split_key_path(key_path):
+        if '[' in part and ']' in part:
+            key_part = part[:part.index('[')]
+            index_part = part[part.index('[') + 1:part.rindex(']')]
+            try:
+                index = int(index_part)
+            except ValueError:
+                index = index_part
+            steps.append((key_part, index))
+        else:
+            steps.append((part, None))
+    return tuple(steps)
+
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_wildcard_path(path_expr: str) -> tuple:
+    """
+    Compile a JSONPath-like expression into (kind, key, index) expansion steps.
+    
+    kind is '*' for key[*] (key may be empty), '[]' for key[N] and '.' for a
+    plain key. index is the int N, or None when N is not a valid integer
+    (such a step never matches).
+    """
+    # Remove leading $ and . if present
+    if path_expr.startswith('$'):
+        path_expr = path_expr[1:]
+    if path_expr.startswith('.'):
+        path_expr = path_expr[1:]
+    
+    steps = []
+    for part in _split_key_path(path_expr):
+        if '[*]' in part:
+            steps.append(('*', part.replace('[*]', ''), None))
+        elif '[' in part and ']' in part:
+            key_part = part[:part.index('[')]
+            index_part = part[part.index('[') + 1:part.rindex(']')]
+            try:
+                index = int(index_part)
+            except ValueError:
+                index = None
+            steps.append(('[]', key_part, index))
+        else:
+            steps.append(('.', part, None))
+    return tuple(steps)
+
+
+_NUMERIC_FILTER_OPERATORS = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+}
+
+
+def _build_filter(field_name: str, op: str, target_value: str) -> callable:
+    """
+    Build the predicate for one parsed filter, specialized to its operator.
+    
+    The operator is dispatched and a numeric target converted once here,
+    rather than for every item tested. Items that are not objects, or lack
+    the field, never match; numeric comparisons fail when either side is
+    not a number.
+    """
+    compare = _NUMERIC_FILTER_OPERATORS.get(op)
+    if compare is not None:
+        try:
+            target_number = float(target_value)
+        except ValueError:
+            # A non-numeric target never compares
+            return lambda item: False
+        
+        def filter_func(item):
+            if not isinstance(item, dict) or field_name not in item:
+                return False
+            try:
+                item_number = float(str(item[field_name]))
+            except (ValueError, TypeError):
+                return False
+            return compare(item_number, target_number)
+        
+        return filter_func
+    
+    if op == '==':
+        def matches(text):
+            return text == target_value
+    elif op == '!=':
+        def matches(text):
+            return text != target_value
+    elif op == 'contains':
+        def matches(text):
+            return target_value in text
+    elif op == 'startswith':
+        def matches(text):
+            return text.startswith(target_value)
+    else:  # endswith
+        def matches(text):
+            return text.endswith(target_value)
+    
+    def filter_func(item):
+        if not isinstance(item, dict) or field_name not in item:
+            return False
+        return matches(str(item[field_name]))
+    
+    return filter_func
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_filter_expression(expr: str) -> callable:
+    """
+    Parse filter expressions like [?budget>60000] into filter functions.
+    
+    Cached by expression text, so each distinct filter is parsed once.
+    """
+    # Remove brackets and question mark
+    expr = expr.strip()
+    if expr.startswith('[?') and expr.endswith(']'):
+        expr = expr[2:-1]
+    elif expr.startswith('?'):
+        expr = expr[1:]
+    
+    # Parse comparison operators
+    operators = ['>=', '<=', '!=', '==', '>', '<', 'contains', 'startswith', 'endswith']
+    
+    for op in operators:
+        if op in expr:
+            field, value = expr.split(op, 1)
+            field = field.strip()
+            value = value.strip()
+            
+            # Remove quotes from string values
+            if (value.startswith('"') and value.endswith('"')) or (value.startswith("'") and value.endswith("'")):
+                value = value[1:-1]
+            
+            return _build_filter(field, op, value)
+    
+    # If no operator found, assume equality check
+    raise TemplateFunctionError(f"Invalid filter expression: {expr}")
+
+
+COMPONENT_NAME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*$')
+
+
 def validate_component_name(name: str) -> bool:
     """Validate component name against naming standards."""
-    import re
-    COMPONENT_NAME_PATTERN = re.compile(r'^[a-zA-Z][a-zA-Z0-9_-]*$')
     return bool(COMPONENT_NAME_PATTERN.match(name)) and len(name) <= 50
 
 
@@ -88,7 +351,78 @@ class TemplateFunctions:
         if base_dir is None:
             base_dir = Path.cwd()
         self.base_dir = Path(base_dir)
+        self.reset_components(components)
+        # Resolved path strings by template path, see _resolve_path_str
+        self._resolved_paths = OrderedDict()
+        # Parsed file contents by path, stored as ((mtime_ns, size), value)
+        # in least recently used order, see _load_cached
+        self._file_cache = OrderedDict()
+        self._csv_cache = OrderedDict()
+        self._json_cache = OrderedDict()
+        self._line_index_cache = OrderedDict()
+        # Per-column CSV derivations, stored as (rows they came from, value),
+        # see _get_derived. Keys are (path, kind, ...) where kind names the
+        # derivation: 'headers', 'values', 'joined', 'numeric', 'filter_rows'
+        # or 'where'
+        self._csv_column_cache = OrderedDict()
+        # json_keys results by (path, expression), stored as (data, keys)
+        self._json_keys_cache = OrderedDict()
+        # Open SQLite connections by path, stored as ((st_dev, st_ino), connection)
+        # in least recently used order, see _get_sqlite_connection
+        self._sqlite_connections = OrderedDict()
+        # Serializes use of the shared connections under parallel evaluation
+        self._sqlite_lock = threading.RLock()
+    
+    def reset_components(self, components: List = None) -> None:
+        """
+        Replace the components used for TARGET_FILE resolution.
+        
+        Lets one instance, and its file caches, be reused across test
+        questions that target different components.
+        
+        Args:
+            components: List of ComponentSpec objects for TARGET_FILE resolution
+        """
         self.components = components or []
+        # Target file by component name; the first component with a name wins,
+        # as in resolve_target_file's scan
+        self._target_files = {}
+        for component in self.components:
+            if hasattr(component, 'name') and hasattr(component, 'target_file'):
+                self._target_files.setdefault(component.name, component.target_file or "")
+    
+    def clear_caches(self) -> None:
+        """
+        Drop all cached file contents and close cached SQLite connections.
+        
+        Cached entries already revalidate against each file's mtime and size,
+        so this is only needed to release memory and database handles, or
+        after rewriting a file without changing either.
+        """
+        self._resolved_paths.clear()
+        self._file_cache.clear()
+        self._csv_cache.clear()
+        self._json_cache.clear()
+        self._line_index_cache.clear()
+        self._csv_column_cache.clear()
+        self._json_keys_cache.clear()
+        self._close_sqlite_connections()
+    
+    def close(self) -> None:
+        """Close cached SQLite connections and drop all cached file contents."""
+        self.clear_caches()
+    
+    def __del__(self):
+        # Connections may be missing if __init__ failed part way
+        if getattr(self, '_sqlite_connections', None):
+            self._close_sqlite_connections()
+    
+    def _close_sqlite_connections(self) -> None:
+        """Close and forget every cached SQLite connection."""
+        with self._sqlite_lock:
+            while self._sqlite_connections:
+                _, (_, conn) = self._sqlite_connections.popitem(last=False)
+                conn.close()
     
     def evaluate_all_functions(self, text: str) -> str:
         """
@@ -100,31 +434,49 @@ class TemplateFunctions:
         Returns:
             Text with all template functions replaced with their results
         """
-        if not text:
+        # Substring search is far cheaper than a parse (or parse cache
+        # lookup, which hashes the whole text) for text with no calls
+        if not text or '{{' not in text:
             return text
         
-        # Pattern to match template functions: {{function_name:args}}
-        pattern = r'\{\{([^:]+):([^}]+)\}\}'
+        try:
+            calls = _parse_template(text)
+        except Exception as e:
+            raise TemplateFunctionError(f"Error processing template functions in '{text}': {e}")
         
-        def replace_function(match):
-            function_name = match.group(1).strip()
-            args_str = match.group(2).strip()
-            args = [arg.strip() for arg in args_str.split(':')]
-            
-            try:
-                return str(self.evaluate_function(function_name, args))
-            except Exception as e:
-                raise TemplateFunctionError(f"Error evaluating {{{{{function_name}:{args_str}}}}}: {e}")
+        if not calls:
+            return text
         
+        if len(calls) > 1 and os.environ.get(_PARALLEL_ENV_VAR) == '1':
+            executor = _get_parallel_executor()
+            futures = [executor.submit(self._evaluate_call, function_name, args_str, args)
+                       for _, _, function_name, args_str, args in calls]
+            # Results are taken in template order, so the first failing call
+            # in the text is the error raised, as in sequential evaluation
+            values = (future.result() for future in futures)
+        else:
+            values = (self._evaluate_call(function_name, args_str, args)
+                      for _, _, function_name, args_str, args in calls)
+        
+        pieces = []
+        position = 0
+        for (start, end, _, _, _), value in zip(calls, values):
+            pieces.append(text[position:start])
+            pieces.append(value)
+            position = end
+        pieces.append(text[position:])
+        
+        return ''.join(pieces)
+    
+    def _evaluate_call(self, function_name: str, args_str: str, args: Sequence[str]) -> str:
+        """Evaluate one parsed template function call to its text."""
         try:
-            result = re.sub(pattern, replace_function, text)
-            return result
-        except TemplateFunctionError:
-            raise
+            # Functions only read their arguments, so the cached tuple is passed as-is
+            return str(self.evaluate_function(function_name, args))
         except Exception as e:
-            raise TemplateFunctionError(f"Error processing template functions in '{text}': {e}")
+            raise TemplateFunctionError(f"Error evaluating {{{{{function_name}:{args_str}}}}}: {e}")
     
-    def evaluate_function(self, function_name: str, args: List[str]) -> Any:
+    def evaluate_function(self, function_name: str, args: Sequence[str]) -> Any:
         """
         Evaluate a single template function.
         
@@ -135,61 +487,11 @@ class TemplateFunctions:
         Returns:
             Result of the function evaluation
         """
-        # Map function names to methods
-        function_map = {
-            'file_line': self._file_line,
-            'file_word': self._file_word,
-            'file_line_count': self._file_line_count,
-            'file_word_count': self._file_word_count,
-            'csv_cell': self._csv_cell,
-            'csv_row': self._csv_row,
-            'csv_column': self._csv_column,
-            'csv_value': self._csv_value,
-            'csv_sum': self._csv_sum,
-            'csv_avg': self._csv_avg,
-            'csv_count': self._csv_count,
-            'csv_sum_where': self._csv_sum_where,
-            'csv_avg_where': self._csv_avg_where,
-            'csv_count_where': self._csv_count_where,
-            'sqlite_query': self._sqlite_query,
-            'sqlite_value': self._sqlite_value,
-            'json_path': self._json_path,
-            'json_value': self._json_value,
-            'json_count': self._json_count,
-            'json_keys': self._json_keys,
-            'json_sum': self._json_sum,
-            'json_avg': self._json_avg,
-            'json_max': self._json_max,
-            'json_min': self._json_min,
-            'json_collect': self._json_collect,
-            'json_count_where': self._json_count_where,
-            'json_filter': self._json_filter,
-            'yaml_path': self._yaml_path,
-            'yaml_value': self._yaml_value,
-            'yaml_count': self._yaml_count,
-            'yaml_keys': self._yaml_keys,
-            'yaml_sum': self._yaml_sum,
-            'yaml_avg': self._yaml_avg,
-            'yaml_max': self._yaml_max,
-            'yaml_min': self._yaml_min,
-            'yaml_collect': self._yaml_collect,
-            'yaml_count_where': self._yaml_count_where,
-            'yaml_filter': self._yaml_filter,
-            'xpath_value': self._xpath_value,
-            'xpath_attr': self._xpath_attr,
-            'xpath_count': self._xpath_count,
-            'xpath_exists': self._xpath_exists,
-            'xpath_collect': self._xpath_collect,
-            'xpath_sum': self._xpath_sum,
-            'xpath_avg': self._xpath_avg,
-            'xpath_max': self._xpath_max,
-            'xpath_min': self._xpath_min,
-        }
-        
-        if function_name not in function_map:
+        method_name = _TEMPLATE_FUNCTIONS.get(function_name)
+        if method_name is None:
             raise TemplateFunctionError(f"Unknown template function: {function_name}")
         
-        return function_map[function_name](args)
+        return getattr(self, method_name)(args)
     
     def _resolve_path(self, path: str) -> Path:
         """Resolve a file path relative to base directory."""
@@ -198,6 +500,21 @@ class TemplateFunctions:
             file_path = self.base_dir / file_path
         return file_path
     
+    def _resolve_path_str(self, path: str) -> str:
+        """
+        Resolve a file path like _resolve_path, as a string.
+        
+        Used by the readers that are called repeatedly for the same paths;
+        resolving once and caching the string avoids building Path objects
+        on every template evaluation.
+        """
+        resolved = self._resolved_paths.get(path)
+        if resolved is None:
+            resolved = str(self._resolve_path(path))
+            self._resolved_paths[path] = resolved
+            self._trim_cache(self._resolved_paths, _DERIVED_CACHE_MAX_ENTRIES)
+        return resolved
+    
     def _resolve_target_file(self, path: str) -> str:
         """
         Resolve TARGET_FILE[component_name] to actual target file path.
@@ -208,33 +525,134 @@ class TemplateFunctions:
         Returns:
             Resolved path with TARGET_FILE resolved if applicable
         """
+        # Most arguments are literal paths; only TARGET_FILE needs resolving
+        if not path or not path.startswith('TARGET_FILE'):
+            return path
+        
+        # Known components are a dict lookup; resolve_target_file reports errors
+        if path.startswith("TARGET_FILE[") and path.endswith("]"):
+            component_name = path[12:-1]
+            target_file = self._target_files.get(component_name)
+            if target_file is not None and validate_component_name(component_name):
+                return target_file
         return resolve_target_file(path, self.components)
     
-    def _read_file_lines(self, path: str) -> List[str]:
-        """Read file and return list of lines (without newlines)."""
-        file_path = self._resolve_path(path)
+    def _stat_file(self, file_path: str, not_found_message: str) -> os.stat_result:
+        """
+        Stat a file, raising TemplateFunctionError if it does not exist.
         
-        if not file_path.exists():
-            raise TemplateFunctionError(f"File not found: {file_path}")
+        A single os.stat serves as both the existence check and the source of
+        the mtime/size used to validate cached contents.
+        """
+        try:
+            return os.stat(file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise TemplateFunctionError(f"{not_found_message}: {file_path}") from None
+    
+    def _load_cached(self, cache: OrderedDict, file_path: str, stat: os.stat_result, loader,
+                     derived: OrderedDict = None) -> Any:
+        """
+        Return loader(file_path), reusing the previous result while the file is unchanged.
+        
+        Entries are keyed by path and validated against the file's mtime and
+        size (from stat), so an edited file is reloaded. At most
+        _FILE_CACHE_MAX_ENTRIES files are kept, dropping the least recently
+        used. Cached values are shared between calls and must not be mutated.
+        Results derived from a replaced or dropped value are removed from
+        derived, so they do not keep it alive.
+        """
+        signature = (stat.st_mtime_ns, stat.st_size)
+        
+        cached = cache.get(file_path)
+        if cached is not None and cached[0] == signature:
+            try:
+                cache.move_to_end(file_path)
+            except KeyError:
+                # Evicted by a parallel evaluation in the meantime
+                pass
+            return cached[1]
+        
+        value = loader(file_path)
+        # Re-inserting places the entry last, as most recently used
+        replaced = cache.pop(file_path, None)
+        cache[file_path] = (signature, value)
+        dropped = self._trim_cache(cache, _FILE_CACHE_MAX_ENTRIES)
+        if replaced is not None:
+            dropped.append(replaced)
+        if derived and dropped:
+            dropped_ids = {id(entry[1]) for entry in dropped}
+            for key, entry in list(derived.items()):
+                if id(entry[0]) in dropped_ids:
+                    derived.pop(key, None)
+        return value
+    
+    def _trim_cache(self, cache: OrderedDict, max_entries: int) -> List[Any]:
+        """Drop least recently used entries beyond max_entries, returning their values."""
+        dropped = []
+        while len(cache) > max_entries:
+            try:
+                dropped.append(cache.popitem(last=False)[1])
+            except KeyError:
+                # Emptied by a parallel evaluation in the meantime
+                break
+        return dropped
+    
+    def _get_derived(self, cache: OrderedDict, key: tuple, data: Any) -> Any:
+        """
+        Return the result cached under key if it was derived from data, else None.
         
+        Derived caches store (source, result) pairs; a reloaded file is a new
+        source object, so results from the old one are not returned.
+        """
+        cached = cache.get(key)
+        if cached is None or cached[0] is not data:
+            return None
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return [line.rstrip('\n\r') for line in f.readlines()]
-        except Exception as e:
-            raise TemplateFunctionError(f"Error reading file {file_path}: {e}")
+            cache.move_to_end(key)
+        except KeyError:
+            # Evicted by a parallel evaluation in the meantime
+            pass
+        return cached[1]
     
-    def _read_file_text(self, path: str) -> str:
-        """Read entire file as text."""
-        file_path = self._resolve_path(path)
+    def _set_derived(self, cache: OrderedDict, key: tuple, data: Any, result: Any) -> None:
+        """Cache a result derived from data, keeping _DERIVED_CACHE_MAX_ENTRIES at most."""
+        cache.pop(key, None)
+        cache[key] = (data, result)
+        self._trim_cache(cache, _DERIVED_CACHE_MAX_ENTRIES)
+    
+    def _read_file_lines(self, path: str) -> List[str]:
+        """Read file and return list of lines (without newlines)."""
+        file_path = self._resolve_path_str(path)
         
-        if not file_path.exists():
-            raise TemplateFunctionError(f"File not found: {file_path}")
+        stat = self._stat_file(file_path, "File not found")
+        return self._load_cached(self._file_cache, file_path, stat, self._load_file_contents)[0]
+    
+    def _read_file_words(self, path: str) -> List[str]:
+        """Read file and return its whitespace-separated words."""
+        file_path = self._resolve_path_str(path)
+        
+        stat = self._stat_file(file_path, "File not found")
+        return self._load_cached(self._file_cache, file_path, stat, self._load_file_contents)[1]
+    
+    def _load_file_contents(self, file_path: str) -> Tuple[List[str], List[str]]:
+        """
+        Read an existing file once into (lines, words), uncached.
         
+        Both come from the same text so all file_* functions share one read.
+        Text mode has already turned every line ending into '\n', so
+        splitting on it matches readlines() with the endings stripped.
+        """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+                text = f.read()
         except Exception as e:
             raise TemplateFunctionError(f"Error reading file {file_path}: {e}")
+        
+        lines = text.split('\n')
+        if lines[-1] == '':
+            # Trailing newline (or empty file) does not start another line
+            lines.pop()
+        return lines, text.split()
     
     # File content extraction functions
     
@@ -249,7 +667,15 @@ class TemplateFunctions:
             raise TemplateFunctionError(f"Invalid line number: {args[0]}")
         
         path = self._resolve_target_file(args[1])
-        lines = self._read_file_lines(path)
+        file_path = self._resolve_path_str(path)
+        stat = self._stat_file(file_path, "File not found")
+        
+        if stat.st_size >= _MMAP_LINE_MIN_SIZE and file_path not in self._file_cache and line_number >= 1:
+            line = self._read_line_indexed(file_path, stat, line_number)
+            if line is not None:
+                return line
+        
+        lines = self._load_cached(self._file_cache, file_path, stat, self._load_file_contents)[0]
         
         # Convert to 0-based indexing
         if line_number < 1 or line_number > len(lines):
@@ -257,6 +683,84 @@ class TemplateFunctions:
         
         return lines[line_number - 1]
     
+    def _read_line_indexed(self, file_path: str, stat: os.stat_result, line_number: int) -> Optional[str]:
+        """
+        Read one line (1-based) of a large file without reading the rest of it.
+        
+        The first call indexes where every line starts (cached like parsed
+        contents); each call then reads just the requested line's bytes.
+        Returns None when the answer must come from a full read instead: the
+        line does not exist (so the error can report the line count), a
+        carriage return before it could make text-mode line splitting
+        differ, or the file is not valid UTF-8 anywhere (so file_line fails
+        on it like file_line_count does).
+        """
+        index = self._load_cached(self._line_index_cache, file_path, stat, self._index_line_starts)
+        if index is None:
+            return None
+        line_starts, first_carriage_return = index
+        if line_number > len(line_starts):
+            return None
+        
+        start = line_starts[line_number - 1]
+        if line_number < len(line_starts):
+            end = line_starts[line_number] - 1
+        else:
+            end = stat.st_size
+        if 0 <= first_carriage_return < end:
+            return None
+        
+        try:
+            with open(file_path, 'rb') as f:
+                f.seek(start)
+                raw = f.read(end - start)
+        except OSError:
+            return None
+        
+        if line_number == len(line_starts) and raw.endswith(b'\n'):
+            # Trailing newline of the last line
+            raw = raw[:-1]
+        try:
+            return raw.decode('utf-8')
+        except UnicodeDecodeError:
+            # The full read reports the error
+            return None
+    
+    def _index_line_starts(self, file_path: str) -> Optional[Tuple[array, int]]:
+        """
+        Index an existing file's lines, uncached.
+        
+        Returns (byte offset where each line starts, offset of the first
+        carriage return or -1), or None if the file cannot be mapped or is
+        not valid UTF-8. Every chunk is decoded while indexing, so the whole
+        file is validated once per cached index. Lines are split as in
+        _load_file_contents: a trailing newline does not start another line.
+        Only lines before the first carriage return match text-mode reading.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    first_carriage_return = mm.find(b'\r')
+                    size = len(mm)
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                    line_starts = array('q', [0])
+                    for chunk_start in range(0, size, _MMAP_CHUNK_SIZE):
+                        chunk = mm[chunk_start:chunk_start + _MMAP_CHUNK_SIZE]
+                        decoder.decode(chunk)
+                        lines = chunk.split(b'\n')
+                        # Each newline in the chunk starts a line just after it
+                        lines.pop()
+                        line_ends = accumulate(map((1).__add__, map(len, lines)), initial=chunk_start)
+                        line_starts.extend(islice(line_ends, 1, None))
+                    decoder.decode(b'', final=True)
+        except (OSError, ValueError):
+            # UnicodeDecodeError is a ValueError; the full read reports errors
+            return None
+        
+        if len(line_starts) > 1 and line_starts[-1] == size:
+            line_starts.pop()
+        return line_starts, first_carriage_return
+    
     def _file_word(self, args: List[str]) -> str:
         """Get Nth word from entire file. Usage: {{file_word:N:path}}"""
         if len(args) != 2:
@@ -268,8 +772,7 @@ class TemplateFunctions:
             raise TemplateFunctionError(f"Invalid word number: {args[0]}")
         
         path = self._resolve_target_file(args[1])
-        text = self._read_file_text(path)
-        words = text.split()
+        words = self._read_file_words(path)
         
         # Convert to 0-based indexing
         if word_number < 1 or word_number > len(words):
@@ -283,35 +786,117 @@ class TemplateFunctions:
             raise TemplateFunctionError("file_line_count requires exactly 1 argument: file_path")
         
         path = self._resolve_target_file(args[0])
-        lines = self._read_file_lines(path)
+        file_path = self._resolve_path_str(path)
+        stat = self._stat_file(file_path, "File not found")
+        
+        if stat.st_size >= _MMAP_LINE_MIN_SIZE and file_path not in self._file_cache:
+            line_count = self._count_lines_mmap(file_path)
+            if line_count is not None:
+                return line_count
+        
+        lines = self._load_cached(self._file_cache, file_path, stat, self._load_file_contents)[0]
         return len(lines)
     
+    def _count_lines_mmap(self, file_path: str) -> Optional[int]:
+        """
+        Count the lines of a large file without building its list of lines.
+        
+        Newlines are counted chunk by chunk with bytes.count. Each chunk is
+        also decoded, so invalid UTF-8 still fails as in the full read.
+        Returns None when the full read must be used instead: a carriage
+        return could make text-mode line splitting differ, or the file does
+        not decode.
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if mm.find(b'\r') >= 0:
+                        return None
+                    
+                    decoder = codecs.getincrementaldecoder('utf-8')()
+                    line_count = 0
+                    for start in range(0, len(mm), _MMAP_CHUNK_SIZE):
+                        chunk = mm[start:start + _MMAP_CHUNK_SIZE]
+                        decoder.decode(chunk)
+                        line_count += chunk.count(b'\n')
+                    decoder.decode(b'', final=True)
+                    
+                    if len(mm) and mm[-1:] != b'\n':
+                        # Last line has no trailing newline
+                        line_count += 1
+                    return line_count
+        except (OSError, ValueError):
+            # UnicodeDecodeError is a ValueError; the full read reports errors
+            return None
+    
     def _file_word_count(self, args: List[str]) -> int:
         """Count total words in file. Usage: {{file_word_count:path}}"""
         if len(args) != 1:
             raise TemplateFunctionError("file_word_count requires exactly 1 argument: file_path")
         
         path = self._resolve_target_file(args[0])
-        text = self._read_file_text(path)
-        words = text.split()
+        words = self._read_file_words(path)
         return len(words)
     
     # CSV-specific extraction functions
     
     def _read_csv_data(self, path: str) -> List[List[str]]:
         """Read CSV file and return list of rows."""
-        file_path = self._resolve_path(path)
-        
-        if not file_path.exists():
-            raise TemplateFunctionError(f"CSV file not found: {file_path}")
+        file_path = self._resolve_path_str(path)
         
+        stat = self._stat_file(file_path, "CSV file not found")
+        return self._load_cached(self._csv_cache, file_path, stat, self._load_csv_data,
+                                 self._csv_column_cache)
+    
+    def _load_csv_data(self, file_path: str) -> List[List[str]]:
+        """Read rows from an existing CSV file, uncached."""
         try:
+            # One bulk read; newline='' on both sides keeps csv's own handling
+            # of line endings inside quoted fields
             with open(file_path, 'r', encoding='utf-8', newline='') as f:
-                reader = csv.reader(f)
-                return list(reader)
+                text = f.read()
+            return list(csv.reader(io.StringIO(text, newline='')))
         except Exception as e:
             raise TemplateFunctionError(f"Error reading CSV file {file_path}: {e}")
     
+    def _csv_column_index(self, path: str, data: List[List[str]], header: str) -> int:
+        """
+        Return the index of the first column named header.
+        
+        Raises ValueError like headers.index(header) would, but looks the name
+        up in a header dict built once per loaded file.
+        """
+        key = (path, 'headers')
+        header_index = self._get_derived(self._csv_column_cache, key, data)
+        if header_index is None:
+            header_index = {}
+            for index, name in enumerate(data[0]):
+                header_index.setdefault(name, index)
+            self._set_derived(self._csv_column_cache, key, data, header_index)
+        
+        try:
+            return header_index[header]
+        except KeyError:
+            raise ValueError(f"{header!r} is not in list") from None
+    
+    def _csv_string_column(self, path: str, data: List[List[str]], column_index: int) -> tuple:
+        """
+        Return a column's cells below the header, with '' for rows that lack it.
+        
+        Built once per loaded file (cached like the other per-column
+        derivations) and shared by csv_column, the aggregations and the
+        filters, so each column is pulled out of the rows only once.
+        """
+        key = (path, 'values', column_index)
+        cached = self._get_derived(self._csv_column_cache, key, data)
+        if cached is not None:
+            return cached
+        
+        column_values = tuple(row[column_index] if column_index < len(row) else ''
+                              for row in data[1:])  # Skip header
+        self._set_derived(self._csv_column_cache, key, data, column_values)
+        return column_values
+    
     def _csv_cell(self, args: List[str]) -> str:
         """Get cell at row N, column M (0-indexed). Usage: {{csv_cell:row:column:path}}"""
         if len(args) != 3:
@@ -366,19 +951,19 @@ class TemplateFunctions:
         
         headers = data[0]
         try:
-            column_index = headers.index(header)
+            column_index = self._csv_column_index(path, data, header)
         except ValueError:
             raise TemplateFunctionError(f"Header '{header}' not found in CSV. Available headers: {headers}")
         
-        # Extract column values (skip header row)
-        column_values = []
-        for row in data[1:]:
-            if column_index < len(row):
-                column_values.append(row[column_index])
-            else:
-                column_values.append('')  # Handle rows with missing columns
+        # The joined column is cached with the other per-column derivations
+        key = (path, 'joined', column_index)
+        cached = self._get_derived(self._csv_column_cache, key, data)
+        if cached is not None:
+            return cached
         
-        return ','.join(column_values)
+        joined = ','.join(self._csv_string_column(path, data, column_index))
+        self._set_derived(self._csv_column_cache, key, data, joined)
+        return joined
     
     def _csv_value(self, args: List[str]) -> str:
         """Get cell by row number and column header. Usage: {{csv_value:row:header:path}}"""
@@ -399,7 +984,7 @@ class TemplateFunctions:
         
         headers = data[0]
         try:
-            column_index = headers.index(header)
+            column_index = self._csv_column_index(path, data, header)
         except ValueError:
             raise TemplateFunctionError(f"Header '{header}' not found in CSV. Available headers: {headers}")
         
@@ -429,20 +1014,11 @@ class TemplateFunctions:
         
         headers = data[0]
         try:
-            column_index = headers.index(column)
+            column_index = self._csv_column_index(path, data, column)
         except ValueError:
             raise TemplateFunctionError(f"Column '{column}' not found in CSV. Available headers: {headers}")
         
-        total = 0
-        count = 0
-        for row in data[1:]:  # Skip header
-            if column_index < len(row) and row[column_index].strip():
-                try:
-                    total += float(row[column_index])
-                    count += 1
-                except ValueError:
-                    # Skip non-numeric values
-                    continue
+        total, _, _ = self._csv_numeric_column(path, data, column_index)
         
         return total
     
@@ -460,20 +1036,11 @@ class TemplateFunctions:
         
         headers = data[0]
         try:
-            column_index = headers.index(column)
+            column_index = self._csv_column_index(path, data, column)
         except ValueError:
             raise TemplateFunctionError(f"Column '{column}' not found in CSV. Available headers: {headers}")
         
-        total = 0
-        count = 0
-        for row in data[1:]:  # Skip header
-            if column_index < len(row) and row[column_index].strip():
-                try:
-                    total += float(row[column_index])
-                    count += 1
-                except ValueError:
-                    # Skip non-numeric values
-                    continue
+        total, count, _ = self._csv_numeric_column(path, data, column_index)
         
         if count == 0:
             raise TemplateFunctionError(f"No numeric values found in column '{column}'")
@@ -494,17 +1061,107 @@ class TemplateFunctions:
         
         headers = data[0]
         try:
-            column_index = headers.index(column)
+            column_index = self._csv_column_index(path, data, column)
         except ValueError:
             raise TemplateFunctionError(f"Column '{column}' not found in CSV. Available headers: {headers}")
         
-        count = 0
-        for row in data[1:]:  # Skip header
-            if column_index < len(row) and row[column_index].strip():
-                count += 1
+        _, _, count = self._csv_numeric_column(path, data, column_index)
         
         return count
     
+    def _csv_numeric_column(self, path: str, data: List[List[str]], column_index: int) -> Tuple[float, int, int]:
+        """
+        Return (sum of numeric values, numeric count, non-empty count) for a CSV column.
+        
+        The column is parsed and reduced once per loaded file, so repeated
+        sums and averages are lookups. Entries remember the rows they were
+        built from, so a reloaded file (a new rows object) is recomputed.
+        """
+        key = (path, 'numeric', column_index)
+        cached = self._get_derived(self._csv_column_cache, key, data)
+        if cached is not None:
+            return cached
+        
+        total = 0
+        numeric = 0
+        non_empty = 0
+        for cell in self._csv_string_column(path, data, column_index):
+            if cell.strip():
+                non_empty += 1
+                try:
+                    total += float(cell)
+                except ValueError:
+                    # Skip non-numeric values
+                    continue
+                numeric += 1
+        
+        result = (total, numeric, non_empty)
+        self._set_derived(self._csv_column_cache, key, data, result)
+        return result
+    
+    def _csv_filter_rows(self, path: str, data: List[List[str]], column_index: int,
+                         filter_column_index: int) -> tuple:
+        """
+        Return (filter cell, numeric value or None) for rows where both cells are non-empty.
+        
+        Cached like _csv_numeric_column, so the *_where functions only apply
+        the filter itself on repeat calls.
+        """
+        key = (path, 'filter_rows', column_index, filter_column_index)
+        cached = self._get_derived(self._csv_column_cache, key, data)
+        if cached is not None:
+            return cached
+        
+        pairs = []
+        cells = zip(self._csv_string_column(path, data, column_index),
+                    self._csv_string_column(path, data, filter_column_index))
+        for cell, filter_cell in cells:
+            if cell.strip() and filter_cell.strip():
+                try:
+                    value = float(cell)
+                except ValueError:
+                    # Non-numeric values still count as matching rows
+                    value = None
+                pairs.append((filter_cell, value))
+        
+        result = tuple(pairs)
+        self._set_derived(self._csv_column_cache, key, data, result)
+        return result
+    
+    def _csv_where_totals(self, path: str, data: List[List[str]], column_index: int,
+                          filter_column_index: int, operator: str, filter_value: str) -> Tuple[float, int, int]:
+        """
+        Return (sum of numeric values, numeric count, matching row count) for a CSV filter.
+        
+        Cached per filter like the other per-column derivations. The filter
+        is applied once per distinct filter cell rather than once per row,
+        since filter columns (status, category, ...) repeat few values.
+        """
+        key = (path, 'where', column_index, filter_column_index, operator, filter_value)
+        cached = self._get_derived(self._csv_column_cache, key, data)
+        if cached is not None:
+            return cached
+        
+        matches = {}
+        total = 0
+        numeric = 0
+        matched = 0
+        for filter_cell, value in self._csv_filter_rows(path, data, column_index, filter_column_index):
+            is_match = matches.get(filter_cell)
+            if is_match is None:
+                is_match = self._apply_filter(filter_cell, operator, filter_value)
+                matches[filter_cell] = is_match
+            if is_match:
+                matched += 1
+                # Non-numeric values (None) are skipped
+                if value is not None:
+                    total += value
+                    numeric += 1
+        
+        result = (total, numeric, matched)
+        self._set_derived(self._csv_column_cache, key, data, result)
+        return result
+    
     def _apply_filter(self, value: str, operator: str, filter_value: str) -> bool:
         """Apply filter operation to compare two values."""
         if not value.strip():
@@ -569,22 +1226,13 @@ class TemplateFunctions:
         
         headers = data[0]
         try:
-            column_index = headers.index(column)
-            filter_column_index = headers.index(filter_column)
+            column_index = self._csv_column_index(path, data, column)
+            filter_column_index = self._csv_column_index(path, data, filter_column)
         except ValueError as e:
             raise TemplateFunctionError(f"Column not found in CSV. Available headers: {headers}. Error: {e}")
         
-        total = 0
-        for row in data[1:]:  # Skip header
-            if (column_index < len(row) and filter_column_index < len(row) and 
-                row[column_index].strip() and row[filter_column_index].strip()):
-                
-                if self._apply_filter(row[filter_column_index], operator, filter_value):
-                    try:
-                        total += float(row[column_index])
-                    except ValueError:
-                        # Skip non-numeric values
-                        continue
+        total, _, _ = self._csv_where_totals(path, data, column_index, filter_column_index,
+                                             operator, filter_value)
         
         return total
     
@@ -602,24 +1250,13 @@ class TemplateFunctions:
         
         headers = data[0]
         try:
-            column_index = headers.index(column)
-            filter_column_index = headers.index(filter_column)
+            column_index = self._csv_column_index(path, data, column)
+            filter_column_index = self._csv_column_index(path, data, filter_column)
         except ValueError as e:
             raise TemplateFunctionError(f"Column not found in CSV. Available headers: {headers}. Error: {e}")
         
-        total = 0
-        count = 0
-        for row in data[1:]:  # Skip header
-            if (column_index < len(row) and filter_column_index < len(row) and 
-                row[column_index].strip() and row[filter_column_index].strip()):
-                
-                if self._apply_filter(row[filter_column_index], operator, filter_value):
-                    try:
-                        total += float(row[column_index])
-                        count += 1
-                    except ValueError:
-                        # Skip non-numeric values
-                        continue
+        total, count, _ = self._csv_where_totals(path, data, column_index, filter_column_index,
+                                                 operator, filter_value)
         
         if count == 0:
             raise TemplateFunctionError(f"No numeric values found in column '{column}' matching filter criteria")
@@ -640,23 +1277,62 @@ class TemplateFunctions:
         
         headers = data[0]
         try:
-            column_index = headers.index(column)
-            filter_column_index = headers.index(filter_column)
+            column_index = self._csv_column_index(path, data, column)
+            filter_column_index = self._csv_column_index(path, data, filter_column)
         except ValueError as e:
             raise TemplateFunctionError(f"Column not found in CSV. Available headers: {headers}. Error: {e}")
         
-        count = 0
-        for row in data[1:]:  # Skip header
-            if (column_index < len(row) and filter_column_index < len(row) and 
-                row[column_index].strip() and row[filter_column_index].strip()):
-                
-                if self._apply_filter(row[filter_column_index], operator, filter_value):
-                    count += 1
+        _, _, count = self._csv_where_totals(path, data, column_index, filter_column_index,
+                                             operator, filter_value)
         
         return count
     
     # SQLite-specific extraction functions
     
+    def _get_sqlite_connection(self, file_path: str, stat: os.stat_result) -> sqlite3.Connection:
+        """
+        Return a connection to the database at file_path, reusing an open one.
+        
+        Connections stay open until evicted or until clear_caches/close, so
+        repeated queries skip connecting and benefit from sqlite3's
+        per-connection statement cache. At most _SQLITE_MAX_CONNECTIONS are
+        kept, closing the least recently used. A connection is replaced if
+        the file at the path has been replaced (e.g. regenerated), since it
+        would still read the old file.
+        """
+        identity = (stat.st_dev, stat.st_ino)
+        
+        cached = self._sqlite_connections.get(file_path)
+        if cached is not None:
+            if cached[0] == identity:
+                self._sqlite_connections.move_to_end(file_path)
+                return cached[1]
+            del self._sqlite_connections[file_path]
+            cached[1].close()
+        
+        conn = sqlite3.connect(file_path, check_same_thread=False,
+                               cached_statements=_SQLITE_CACHED_STATEMENTS)
+        # Per-connection settings only; journal_mode is left alone because
+        # changing it on a WAL database would rewrite the file's header.
+        # query_only makes any statement that would modify the database fail,
+        # so template queries can never change the files they read
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA mmap_size={_SQLITE_MMAP_SIZE}")
+        # A negative cache_size is in KiB rather than pages
+        conn.execute(f"PRAGMA cache_size=-{_SQLITE_CACHE_SIZE_KIB}")
+        self._sqlite_connections[file_path] = (identity, conn)
+        while len(self._sqlite_connections) > _SQLITE_MAX_CONNECTIONS:
+            _, (_, evicted) = self._sqlite_connections.popitem(last=False)
+            evicted.close()
+        return conn
+    
+    def _end_sqlite_call(self, conn: sqlite3.Connection) -> None:
+        """Discard any uncommitted changes, as closing a per-call connection used to."""
+        if conn.in_transaction:
+            conn.rollback()
+    
     def _sqlite_query(self, args: List[str]) -> str:
         """Execute arbitrary SQL query and return first result. Usage: {{sqlite_query:SELECT name FROM users:path}}"""
         if len(args) != 2:
@@ -665,29 +1341,29 @@ class TemplateFunctions:
         sql_query = args[0]
         path = self._resolve_target_file(args[1])
         
-        file_path = self._resolve_path(path)
-        if not file_path.exists():
-            raise TemplateFunctionError(f"SQLite file not found: {file_path}")
+        file_path = self._resolve_path_str(path)
+        stat = self._stat_file(file_path, "SQLite file not found")
         
-        try:
-            conn = sqlite3.connect(str(file_path))
+        with self._sqlite_lock:
             try:
-                cursor = conn.execute(sql_query)
-                result = cursor.fetchone()
+                conn = self._get_sqlite_connection(file_path, stat)
+                try:
+                    cursor = conn.execute(sql_query)
+                    result = cursor.fetchone()
                 
-                if result is None:
-                    raise TemplateFunctionError(f"SQL query returned no results: {sql_query}")
+                    if result is None:
+                        raise TemplateFunctionError(f"SQL query returned no results: {sql_query}")
                 
-                # Return first column of first row
-                return str(result[0]) if result[0] is not None else ""
+                    # Return first column of first row
+                    return str(result[0]) if result[0] is not None else ""
                 
-            finally:
-                conn.close()
+                finally:
+                    self._end_sqlite_call(conn)
                 
-        except sqlite3.Error as e:
-            raise TemplateFunctionError(f"SQLite error executing '{sql_query}': {e}")
-        except Exception as e:
-            raise TemplateFunctionError(f"Error executing SQLite query '{sql_query}': {e}")
+            except sqlite3.Error as e:
+                raise TemplateFunctionError(f"SQLite error executing '{sql_query}': {e}")
+            except Exception as e:
+                raise TemplateFunctionError(f"Error executing SQLite query '{sql_query}': {e}")
     
     def _sqlite_value(self, args: List[str]) -> str:
         """Get value by row and column from first table. Usage: {{sqlite_value:row:column:path}} or {{sqlite_value:row:column:table:path}}"""
@@ -707,64 +1383,75 @@ class TemplateFunctions:
             table_name = None
             path = self._resolve_target_file(args[2])
         
-        file_path = self._resolve_path(path)
-        if not file_path.exists():
-            raise TemplateFunctionError(f"SQLite file not found: {file_path}")
+        file_path = self._resolve_path_str(path)
+        stat = self._stat_file(file_path, "SQLite file not found")
         
-        try:
-            conn = sqlite3.connect(str(file_path))
+        with self._sqlite_lock:
             try:
-                # If no table specified, get the first table
-                if table_name is None:
-                    cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                    tables = cursor.fetchall()
-                    if not tables:
-                        raise TemplateFunctionError("No tables found in SQLite database")
-                    table_name = tables[0][0]
-                
-                # Try to parse column as integer index first
+                conn = self._get_sqlite_connection(file_path, stat)
                 try:
-                    column_index = int(column)
-                    # Get column names to validate index
-                    cursor = conn.execute(f"PRAGMA table_info({table_name})")
-                    columns = cursor.fetchall()
-                    if column_index < 0 or column_index >= len(columns):
-                        raise TemplateFunctionError(f"Column index {column_index} out of range (table has {len(columns)} columns)")
-                    column_name = columns[column_index][1]  # Column name is at index 1
-                except ValueError:
-                    # Column is a name, not an index
-                    column_name = column
+                    # If no table specified, get the first table
+                    if table_name is None:
+                        cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+                        tables = cursor.fetchall()
+                        if not tables:
+                            raise TemplateFunctionError("No tables found in SQLite database")
+                        table_name = tables[0][0]
                 
-                # Execute query to get the value
-                sql_query = f"SELECT {column_name} FROM {table_name} LIMIT 1 OFFSET {row}"
-                cursor = conn.execute(sql_query)
-                result = cursor.fetchone()
+                    # Try to parse column as integer index first
+                    try:
+                        column_index = int(column)
+                        # Get column names to validate index
+                        cursor = conn.execute(f"PRAGMA table_info({table_name})")
+                        columns = cursor.fetchall()
+                        if column_index < 0 or column_index >= len(columns):
+                            raise TemplateFunctionError(f"Column index {column_index} out of range (table has {len(columns)} columns)")
+                        column_name = columns[column_index][1]  # Column name is at index 1
+                    except ValueError:
+                        # Column is a name, not an index
+                        column_name = column
                 
-                if result is None:
-                    raise TemplateFunctionError(f"Row {row} not found in table {table_name}")
+                    # Execute query to get the value
+                    sql_query = f"SELECT {column_name} FROM {table_name} LIMIT 1 OFFSET {row}"
+                    cursor = conn.execute(sql_query)
+                    result = cursor.fetchone()
                 
-                return str(result[0]) if result[0] is not None else ""
+                    if result is None:
+                        raise TemplateFunctionError(f"Row {row} not found in table {table_name}")
                 
-            finally:
-                conn.close()
+                    return str(result[0]) if result[0] is not None else ""
                 
-        except sqlite3.Error as e:
-            raise TemplateFunctionError(f"SQLite error: {e}")
-        except Exception as e:
-            raise TemplateFunctionError(f"Error accessing SQLite database: {e}")
+                finally:
+                    self._end_sqlite_call(conn)
+                
+            except sqlite3.Error as e:
+                raise TemplateFunctionError(f"SQLite error: {e}")
+            except Exception as e:
+                raise TemplateFunctionError(f"Error accessing SQLite database: {e}")
     
     # JSON-specific extraction functions
     
     def _read_json_data(self, path: str) -> Any:
         """Read JSON file and return parsed data."""
-        file_path = self._resolve_path(path)
-        
-        if not file_path.exists():
-            raise TemplateFunctionError(f"JSON file not found: {file_path}")
+        file_path = self._resolve_path_str(path)
         
+        stat = self._stat_file(file_path, "JSON file not found")
+        return self._load_cached(self._json_cache, file_path, stat, self._load_json_data,
+                                 self._json_keys_cache)
+    
+    def _load_json_data(self, file_path: str) -> Any:
+        """Parse an existing JSON file, uncached."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                raw = f.read()
+            if orjson is not None:
+                try:
+                    return orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    # orjson rejects some input json accepts (NaN, huge
+                    # integers); let json decide and produce the error
+                    pass
+            return json.loads(raw.decode('utf-8'))
         except json.JSONDecodeError as e:
             raise TemplateFunctionError(f"Invalid JSON in file {file_path}: {e}")
         except Exception as e:
@@ -845,6 +1532,12 @@ class TemplateFunctions:
         
         data = self._read_json_data(file_path)
         
+        # Keys of a loaded document never change; a reloaded file is new data
+        key = (file_path, path_expr)
+        cached = self._get_derived(self._json_keys_cache, key, data)
+        if cached is not None:
+            return cached
+        
         try:
             if path_expr == "$":
                 target = data
@@ -852,7 +1545,9 @@ class TemplateFunctions:
                 target = self._evaluate_json_path(data, path_expr)
             
             if isinstance(target, dict):
-                return ','.join(target.keys())
+                keys = ','.join(target.keys())
+                self._set_derived(self._json_keys_cache, key, data, keys)
+                return keys
             else:
                 raise TemplateFunctionError(f"Cannot get keys from non-object value: {type(target)}")
         except Exception as e:
@@ -880,35 +1575,11 @@ class TemplateFunctions:
         
         current = data
         
-        # Split path by dots, but handle array indices
-        parts = []
-        current_part = ""
-        bracket_depth = 0
-        
-        for char in key_path:
-            if char == '[':
-                bracket_depth += 1
-                current_part += char
-            elif char == ']':
-                bracket_depth -= 1
-                current_part += char
-            elif char == '.' and bracket_depth == 0:
-                if current_part:
-                    parts.append(current_part)
-                current_part = ""
-            else:
-                current_part += char
-        
-        if current_part:
-            parts.append(current_part)
-        
-        # Navigate through each part
-        for part in parts:
+        # Navigate through each pre-parsed step
+        for part, index in _compile_key_path(key_path):
             # Check for array index notation
-            if '[' in part and ']' in part:
-                # Extract key and index
-                key_part = part[:part.index('[')]
-                index_part = part[part.index('[') + 1:part.rindex(']')]
+            if index is not None:
+                key_part = part
                 
                 # Navigate to the key first (if not empty)
                 if key_part:
@@ -917,15 +1588,13 @@ class TemplateFunctions:
                     current = current[key_part]
                 
                 # Then navigate to the array index
-                try:
-                    index = int(index_part)
-                    if not isinstance(current, list):
-                        raise TemplateFunctionError(f"Cannot index non-array value: {type(current)}")
-                    if index < 0 or index >= len(current):
-                        raise TemplateFunctionError(f"Array index {index} out of range (length: {len(current)})")
-                    current = current[index]
-                except ValueError:
-                    raise TemplateFunctionError(f"Invalid array index: {index_part}")
+                if isinstance(index, str):
+                    raise TemplateFunctionError(f"Invalid array index: {index}")
+                if not isinstance(current, list):
+                    raise TemplateFunctionError(f"Cannot index non-array value: {type(current)}")
+                if index < 0 or index >= len(current):
+                    raise TemplateFunctionError(f"Array index {index} out of range (length: {len(current)})")
+                current = current[index]
             else:
                 # Simple key navigation
                 if not isinstance(current, dict):
@@ -941,90 +1610,34 @@ class TemplateFunctions:
         Expand JSONPath wildcards like $.projects[*].budget into list of values.
         Supports multiple wildcards: $.departments[*].employees[*].name
         """
-        # Remove leading $ if present
-        if path_expr.startswith('$'):
-            path_expr = path_expr[1:]
-        if path_expr.startswith('.'):
-            path_expr = path_expr[1:]
-        
-        if not path_expr:
-            return [data]
-        
-        # Split path and handle wildcards
         current_values = [data]
         
-        # Parse path components
-        parts = []
-        current_part = ""
-        bracket_depth = 0
-        
-        for char in path_expr:
-            if char == '[':
-                bracket_depth += 1
-                current_part += char
-            elif char == ']':
-                bracket_depth -= 1
-                current_part += char
-            elif char == '.' and bracket_depth == 0:
-                if current_part:
-                    parts.append(current_part)
-                current_part = ""
-            else:
-                current_part += char
-        
-        if current_part:
-            parts.append(current_part)
-        
-        # Process each path component
-        for part in parts:
+        # Process each pre-parsed path component
+        for kind, key, index in _compile_wildcard_path(path_expr):
             new_values = []
             
             for current_value in current_values:
-                if '[*]' in part:
-                    # Handle wildcard array access
-                    key_part = part.replace('[*]', '') if part != '[*]' else ''
-                    
-                    if key_part:
-                        # Navigate to the array first
-                        if isinstance(current_value, dict) and key_part in current_value:
-                            array_value = current_value[key_part]
-                        else:
-                            continue  # Skip if key doesn't exist
+                if key:
+                    # Navigate to the key first; skip values without it
+                    if isinstance(current_value, dict) and key in current_value:
+                        value = current_value[key]
                     else:
-                        # Direct array wildcard
-                        array_value = current_value
-                    
-                    if isinstance(array_value, list):
-                        new_values.extend(array_value)
-                    else:
-                        # If not an array, treat as single value
-                        new_values.append(array_value)
-                        
-                elif '[' in part and ']' in part:
-                    # Handle specific array index
-                    key_part = part[:part.index('[')]
-                    index_part = part[part.index('[') + 1:part.rindex(']')]
-                    
-                    try:
-                        if key_part:
-                            if isinstance(current_value, dict) and key_part in current_value:
-                                array_value = current_value[key_part]
-                            else:
-                                continue
-                        else:
-                            array_value = current_value
-                        
-                        if isinstance(array_value, list):
-                            index = int(index_part)
-                            if 0 <= index < len(array_value):
-                                new_values.append(array_value[index])
-                    except (ValueError, TypeError):
                         continue
-                        
                 else:
+                    value = current_value
+                
+                if kind == '.':
                     # Simple key navigation
-                    if isinstance(current_value, dict) and part in current_value:
-                        new_values.append(current_value[part])
+                    new_values.append(value)
+                elif kind == '*':
+                    if isinstance(value, list):
+                        new_values.extend(value)
+                    else:
+                        # If not an array, treat as single value
+                        new_values.append(value)
+                elif isinstance(value, list) and index is not None and 0 <= index < len(value):
+                    # Specific array index
+                    new_values.append(value[index])
             
             current_values = new_values
             
@@ -1038,70 +1651,37 @@ class TemplateFunctions:
         except (ValueError, TypeError):
             return False
     
+    def _numeric_values(self, values: List[Any]) -> List[float]:
+        """
+        Convert the values that _is_numeric accepts to floats, skipping the rest.
+        
+        Same as [float(str(v)) for v in values if self._is_numeric(v)], with
+        one conversion per value. Floats and ints (but not bools, whose str
+        is not numeric) skip the round trip through str.
+        """
+        numeric_values = []
+        for value in values:
+            value_type = type(value)
+            if value_type is float:
+                numeric_values.append(value)
+                continue
+            if value_type is int:
+                try:
+                    numeric_values.append(float(value))
+                    continue
+                except OverflowError:
+                    # float(str(value)) gives inf for ints beyond float range
+                    pass
+            try:
+                numeric_values.append(float(str(value)))
+            except (ValueError, TypeError):
+                # Skip non-numeric values
+                continue
+        return numeric_values
+    
     def _parse_filter_expression(self, expr: str) -> callable:
         """Parse filter expressions like [?budget>60000] into filter functions."""
-        # Remove brackets and question mark
-        expr = expr.strip()
-        if expr.startswith('[?') and expr.endswith(']'):
-            expr = expr[2:-1]
-        elif expr.startswith('?'):
-            expr = expr[1:]
-        
-        # Parse comparison operators
-        operators = ['>=', '<=', '!=', '==', '>', '<', 'contains', 'startswith', 'endswith']
-        
-        for op in operators:
-            if op in expr:
-                field, value = expr.split(op, 1)
-                field = field.strip()
-                value = value.strip()
-                
-                # Remove quotes from string values
-                if (value.startswith('"') and value.endswith('"')) or (value.startswith("'") and value.endswith("'")):
-                    value = value[1:-1]
-                
-                def create_filter(field_name, operator, target_value):
-                    def filter_func(item):
-                        if not isinstance(item, dict) or field_name not in item:
-                            return False
-                        
-                        item_value = item[field_name]
-                        
-                        # Convert to appropriate types for comparison
-                        if operator in ['>', '<', '>=', '<=']:
-                            try:
-                                item_val = float(str(item_value))
-                                target_val = float(str(target_value))
-                                if operator == '>':
-                                    return item_val > target_val
-                                elif operator == '<':
-                                    return item_val < target_val
-                                elif operator == '>=':
-                                    return item_val >= target_val
-                                elif operator == '<=':
-                                    return item_val <= target_val
-                            except (ValueError, TypeError):
-                                return False
-                        
-                        elif operator == '==':
-                            return str(item_value) == str(target_value)
-                        elif operator == '!=':
-                            return str(item_value) != str(target_value)
-                        elif operator == 'contains':
-                            return str(target_value) in str(item_value)
-                        elif operator == 'startswith':
-                            return str(item_value).startswith(str(target_value))
-                        elif operator == 'endswith':
-                            return str(item_value).endswith(str(target_value))
-                        
-                        return False
-                    
-                    return filter_func
-                
-                return create_filter(field, op, value)
-        
-        # If no operator found, assume equality check
-        raise TemplateFunctionError(f"Invalid filter expression: {expr}")
+        return _compile_filter_expression(expr)
     
     def _json_sum(self, args: List[str]) -> str:
         """Sum numeric values in array. Usage: {{json_sum:$.projects[*].budget:file}}"""
@@ -1114,7 +1694,7 @@ class TemplateFunctions:
         
         try:
             values = self._expand_wildcard_path(data, path_expr)
-            numeric_values = [float(str(v)) for v in values if self._is_numeric(v)]
+            numeric_values = self._numeric_values(values)
             return str(sum(numeric_values))
         except Exception as e:
             raise TemplateFunctionError(f"Error calculating JSON sum for '{path_expr}': {e}")
@@ -1130,7 +1710,7 @@ class TemplateFunctions:
         
         try:
             values = self._expand_wildcard_path(data, path_expr)
-            numeric_values = [float(str(v)) for v in values if self._is_numeric(v)]
+            numeric_values = self._numeric_values(values)
             if not numeric_values:
                 return "0"
             return str(sum(numeric_values) / len(numeric_values))
@@ -1148,7 +1728,7 @@ class TemplateFunctions:
         
         try:
             values = self._expand_wildcard_path(data, path_expr)
-            numeric_values = [float(str(v)) for v in values if self._is_numeric(v)]
+            numeric_values = self._numeric_values(values)
             if not numeric_values:
                 return "0"
             return str(max(numeric_values))
@@ -1166,7 +1746,7 @@ class TemplateFunctions:
         
         try:
             values = self._expand_wildcard_path(data, path_expr)
-            numeric_values = [float(str(v)) for v in values if self._is_numeric(v)]
+            numeric_values = self._numeric_values(values)
             if not numeric_values:
                 return "0"
             return str(min(numeric_values))
@@ -1407,7 +1987,7 @@ class TemplateFunctions:
         
         try:
             values = self._expand_wildcard_path(data, path_expr)  # Reuse JSON wildcard logic
-            numeric_values = [float(str(v)) for v in values if self._is_numeric(v)]
+            numeric_values = self._numeric_values(values)
             return str(sum(numeric_values))
         except Exception as e:
             raise TemplateFunctionError(f"Error calculating YAML sum for '{path_expr}': {e}")
@@ -1423,7 +2003,7 @@ class TemplateFunctions:
         
         try:
             values = self._expand_wildcard_path(data, path_expr)  # Reuse JSON wildcard logic
-            numeric_values = [float(str(v)) for v in values if self._is_numeric(v)]
+            numeric_values = self._numeric_values(values)
             if not numeric_values:
                 return "0"
             return str(sum(numeric_values) / len(numeric_values))
@@ -1441,7 +2021,7 @@ class TemplateFunctions:
         
         try:
             values = self._expand_wildcard_path(data, path_expr)  # Reuse JSON wildcard logic
-            numeric_values = [float(str(v)) for v in values if self._is_numeric(v)]
+            numeric_values = self._numeric_values(values)
             if not numeric_values:
                 return "0"
             return str(max(numeric_values))
@@ -1459,7 +2039,7 @@ class TemplateFunctions:
         
         try:
             values = self._expand_wildcard_path(data, path_expr)  # Reuse JSON wildcard logic
-            numeric_values = [float(str(v)) for v in values if self._is_numeric(v)]
+            numeric_values = self._numeric_values(values)
             if not numeric_values:
                 return "0"
             return str(min(numeric_values))
@@ -1904,3 +2484,56 @@ class TemplateFunctions:
         except Exception as e:
             raise TemplateFunctionError(f"Error finding XML minimum for '{xpath}': {e}")
 
+
+# Map function names to the methods implementing them; built once at import.
+# Methods are looked up by name on the instance, so subclass overrides and
+# patched methods are honoured
+_TEMPLATE_FUNCTIONS = {
+    'file_line': '_file_line',
+    'file_word': '_file_word',
+    'file_line_count': '_file_line_count',
+    'file_word_count': '_file_word_count',
+    'csv_cell': '_csv_cell',
+    'csv_row': '_csv_row',
+    'csv_column': '_csv_column',
+    'csv_value': '_csv_value',
+    'csv_sum': '_csv_sum',
+    'csv_avg': '_csv_avg',
+    'csv_count': '_csv_count',
+    'csv_sum_where': '_csv_sum_where',
+    'csv_avg_where': '_csv_avg_where',
+    'csv_count_where': '_csv_count_where',
+    'sqlite_query': '_sqlite_query',
+    'sqlite_value': '_sqlite_value',
+    'json_path': '_json_path',
+    'json_value': '_json_value',
+    'json_count': '_json_count',
+    'json_keys': '_json_keys',
+    'json_sum': '_json_sum',
+    'json_avg': '_json_avg',
+    'json_max': '_json_max',
+    'json_min': '_json_min',
+    'json_collect': '_json_collect',
+    'json_count_where': '_json_count_where',
+    'json_filter': '_json_filter',
+    'yaml_path': '_yaml_path',
+    'yaml_value': '_yaml_value',
+    'yaml_count': '_yaml_count',
+    'yaml_keys': '_yaml_keys',
+    'yaml_sum': '_yaml_sum',
+    'yaml_avg': '_yaml_avg',
+    'yaml_max': '_yaml_max',
+    'yaml_min': '_yaml_min',
+    'yaml_collect': '_yaml_collect',
+    'yaml_count_where': '_yaml_count_where',
+    'yaml_filter': '_yaml_filter',
+    'xpath_value': '_xpath_value',
+    'xpath_attr': '_xpath_attr',
+    'xpath_count': '_xpath_count',
+    'xpath_exists': '_xpath_exists',
+    'xpath_collect': '_xpath_collect',
+    'xpath_sum': '_xpath_sum',
+    'xpath_avg': '_xpath_avg',
+    'xpath_max': '_xpath_max',
+    'xpath_min': '_xpath_min',
+}
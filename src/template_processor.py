@@ -11,7 +11,7 @@ from typing import Dict, Any, List, Optional
 sys.path.append(str(Path(__file__).parent))
 
 from entity_pool import EntityPool
-from template_functions import TemplateFunctions, TemplateFunctionError
+from template_functions import TemplateFunctions, TemplateFunctionError, _TEMPLATE_FUNCTION_RE
 from test_definition_parser import TestDefinitionParser
 
 
@@ -29,6 +29,16 @@ class TemplateProcessor:
         self.entity_pool = EntityPool(entity_pool_file)
         self.template_functions = TemplateFunctions(base_dir)
     
+    def reset_state(self) -> None:
+        """
+        Drop cached file contents so the processor can be reused as if new.
+        
+        The entity pool is kept as loaded, and variable values are already
+        regenerated for every template, so only the template function caches
+        need clearing.
+        """
+        self.template_functions.clear_caches()
+    
     def process_template(self, template: str, question_id: int, sample_number: int, 
                         expected_structure: List[str] = None) -> Dict[str, Any]:
         """
@@ -68,13 +78,11 @@ class TemplateProcessor:
         # Step 3: Template function evaluation (if any)
         try:
             # Check if there are any template functions to process
-            import re
-            function_pattern = r'\{\{([^:]+):([^}]+)\}\}'
-            if re.search(function_pattern, current_template):
+            function_matches = _TEMPLATE_FUNCTION_RE.findall(current_template)
+            if function_matches:
                 result['has_template_functions'] = True
                 
                 # Store function calls before evaluation for debugging
-                function_matches = re.findall(function_pattern, current_template)
                 for func_name, args_str in function_matches:
                     function_call = f"{{{{{func_name}:{args_str}}}}}"
                     result['template_function_results'][function_call] = None  # Will be filled during evaluation
@@ -154,11 +162,9 @@ class TemplateProcessor:
             has_template_functions = False
             
             try:
-                import re
-                function_pattern = r'\{\{([^:]+):([^}]+)\}\}'
-                if re.search(function_pattern, current_template):
+                function_matches = _TEMPLATE_FUNCTION_RE.findall(current_template)
+                if function_matches:
                     has_template_functions = True
-                    function_matches = re.findall(function_pattern, current_template)
                     
                     for func_name, args_str in function_matches:
                         function_call = f"{{{{{func_name}:{args_str}}}}}"
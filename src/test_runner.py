@@ -4,9 +4,12 @@ PICARD Test Runner - Execute LLM benchmark tests
 Main command-line tool for running benchmark tests against LLMs.
 Generates precheck files, executes questions, collects responses, and organizes results.
 """
+import functools
+import os
+import re
 import sys
+import time
 import json
-import argparse
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Tuple
@@ -21,6 +24,14 @@ from sandbox_manager import SandboxManager
 from file_generators import FileGeneratorFactory
 from template_processor import TemplateProcessor
 
+# sanitize_label patterns, compiled once at import
+_LABEL_DISALLOWED_RE = re.compile(r'[^a-z0-9_]')
+_LABEL_UNDERSCORE_RUN_RE = re.compile(r'_+')
+
+# After the first failed write of each kind (response, conversation), only
+# every Nth failure of that kind is printed
+_WRITE_FAILURE_LOG_EVERY = 100
+
 
 class TestRunner:
     """Main test runner for PICARD benchmarks."""
@@ -43,6 +54,9 @@ class TestRunner:
         self.sandbox_manager = SandboxManager(base_dir)
         self.template_processor = TemplateProcessor(base_dir=base_dir)
         self.precheck_generator = None
+        self._stats_cache = None
+        # File generators by sandbox setup type; generate() resets their state
+        self._generator_cache = {}
         
         # Test run info
         self.test_id = None
@@ -51,14 +65,21 @@ class TestRunner:
         # Progressive writing handles
         self.responses_file = None
         self.conversations_dir = None
+        self._conversation_path_prefix = None
+        # Failed writes so far by kind, see _log_write_failure
+        self._write_failures = {'response': 0, 'conversation': 0}
         
         # Timing info
         self.start_time = None
     
-    def sanitize_label(self, label: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def sanitize_label(label: str) -> str:
         """
         Sanitize user-provided label for filesystem compatibility.
         
+        Pure in its input, so results are cached by label.
+        
         Args:
             label: Raw user input label
             
@@ -72,8 +93,6 @@ class TestRunner:
             - Limit length to reasonable bounds
             - Ensure non-empty result
         """
-        import re
-        
         if not label or not label.strip():
             return "test"
         
@@ -81,10 +100,10 @@ class TestRunner:
         sanitized = label.lower().replace(' ', '_').replace('-', '_').replace('.', '_')
         
         # Keep only alphanumeric and underscores 
-        sanitized = re.sub(r'[^a-z0-9_]', '', sanitized)
+        sanitized = _LABEL_DISALLOWED_RE.sub('', sanitized)
         
         # Remove multiple consecutive underscores
-        sanitized = re.sub(r'_+', '_', sanitized)
+        sanitized = _LABEL_UNDERSCORE_RUN_RE.sub('_', sanitized)
         
         # Trim underscores from start/end
         sanitized = sanitized.strip('_')
@@ -99,9 +118,15 @@ class TestRunner:
         
         return sanitized
     
+    def _precheck_statistics(self) -> Dict[str, Any]:
+        """Get test definition statistics, computed once per test run."""
+        if self._stats_cache is None:
+            self._stats_cache = self.precheck_generator.get_statistics()
+        return self._stats_cache
+    
     def _get_timestamp_str(self) -> str:
         """Get current timestamp as formatted string for logging."""
-        return datetime.now().strftime('%H:%M:%S')
+        return time.strftime('%H:%M:%S')
     
     def _format_duration(self, seconds: float) -> str:
         """Format duration in seconds to human-readable string."""
@@ -131,7 +156,7 @@ class TestRunner:
         clean_label = self.sanitize_label(label)
         
         # Generate test ID with custom label
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
         self.test_id = f"{clean_label}_{timestamp}"
         
         # Create test directory
@@ -146,6 +171,7 @@ class TestRunner:
             test_definitions_file=str(test_definitions_file),
             base_dir=str(self.base_dir)
         )
+        self._stats_cache = None
         
         return self.test_id
     
@@ -204,7 +230,7 @@ class TestRunner:
         print(f"[{self._get_timestamp_str()}] 📋 Generating precheck entries...")
         precheck_entries = self.precheck_generator.generate_precheck_entries()
         
-        stats = self.precheck_generator.get_statistics()
+        stats = self._precheck_statistics()
         print(f"[{self._get_timestamp_str()}] ✅ Generated {len(precheck_entries)} precheck entries")
         print(f"   📊 Questions: {stats['total_questions']}")
         print(f"   📊 Total samples: {stats['total_samples']}")
@@ -303,7 +329,10 @@ class TestRunner:
             
             # Create file generator
             generator_type = sandbox_setup.get('type', 'create_files')
-            file_generator = FileGeneratorFactory.create_generator(generator_type, str(self.base_dir))
+            file_generator = self._generator_cache.get(generator_type)
+            if file_generator is None:
+                file_generator = FileGeneratorFactory.create_generator(generator_type, str(self.base_dir))
+                self._generator_cache[generator_type] = file_generator
             
             # Generate files
             generation_result = file_generator.generate(
@@ -337,40 +366,59 @@ class TestRunner:
         # Create and open responses.jsonl for writing
         responses_file_path = self.test_dir / "responses.jsonl"
         self.responses_file = responses_file_path.open('w', encoding='utf-8')
+        self._write_failures = {'response': 0, 'conversation': 0}
         
         # Create conversations directory
         self.conversations_dir = self.test_dir / "conversations"
         self.conversations_dir.mkdir(exist_ok=True)
+        # Conversation files are named q{question_id}_s{sample_number}.json
+        self._conversation_path_prefix = f"{self.conversations_dir}{os.sep}q"
     
     def _write_result_immediately(self, response_entry: Dict[str, Any], conversation_entry: Dict[str, Any]):
         """Write individual result immediately after question completion."""
-        # Write to responses.jsonl immediately
+        # Write to responses.jsonl immediately, so a crash loses no results
         try:
             self.responses_file.write(json.dumps(response_entry) + '\n')
             self.responses_file.flush()  # Force write to disk
         except Exception as e:
-            print(f"⚠️  Failed to write response to JSONL: {e}")
+            self._log_write_failure('response', "Failed to write response to JSONL", e)
             # Continue execution - don't fail entire test
         
         # Write individual conversation file immediately
         try:
             question_id = conversation_entry['question_id']
             sample_number = conversation_entry['sample_number']
-            filename = f"q{question_id}_s{sample_number}.json"
-            conversation_file = self.conversations_dir / filename
+            conversation_file = f"{self._conversation_path_prefix}{question_id}_s{sample_number}.json"
             
             with open(conversation_file, 'w', encoding='utf-8') as f:
                 json.dump(conversation_entry, f, indent=2)
         except Exception as e:
-            print(f"⚠️  Failed to write conversation file: {e}")
+            self._log_write_failure('conversation', "Failed to write conversation file", e)
             # Continue execution - don't fail entire test
     
+    def _log_write_failure(self, kind: str, message: str, error: Exception):
+        """
+        Report a failed result write without flooding the output when every write fails.
+        
+        Failures are counted per kind ('response' or 'conversation'), so the
+        first failure of each kind is always printed; the totals are printed
+        again when the run is finalized.
+        """
+        self._write_failures[kind] += 1
+        count = self._write_failures[kind]
+        if count % _WRITE_FAILURE_LOG_EVERY == 1:
+            print(f"⚠️  {message}: {error} ({kind} write failure {count})")
+    
     def _finalize_progressive_results(self):
         """Close file handles and finalize progressive writing."""
         # Close progressive file handles
         if self.responses_file:
             self.responses_file.close()
             self.responses_file = None
+        
+        for kind, count in self._write_failures.items():
+            if count:
+                print(f"⚠️  {count} {kind} write(s) failed during this run")
             
         # Generate final test summary (same as current implementation)
         self._generate_test_summary()
@@ -460,7 +508,7 @@ class TestRunner:
             'timestamp': datetime.now().isoformat(),
             'test_directory': str(self.test_dir),
             'sandbox_status': self.sandbox_manager.get_sandbox_status(),
-            'statistics': self.precheck_generator.get_statistics() if self.precheck_generator else {},
+            'statistics': self._precheck_statistics() if self.precheck_generator else {},
             'files_generated': {
                 'precheck': 'precheck.jsonl',
                 'responses': 'responses.jsonl'
@@ -476,6 +524,9 @@ class TestRunner:
 
 def main():
     """Command-line interface for the test runner."""
+    # Only the CLI parses arguments; importing TestRunner should not pay for argparse
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='PICARD Framework Benchmark Test Runner',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -6,15 +6,10 @@ import tempfile
 import json
 import yaml
 import csv
-import sys
 import os
 from pathlib import Path
 from typing import Dict, List, Any
 
-# Add src directory to Python path for imports
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root / "src"))
-
 from file_generators import (
     TextFileGenerator, CSVFileGenerator, 
     SQLiteFileGenerator, JSONFileGenerator, YAMLFileGenerator,
@@ -23,6 +18,17 @@ from file_generators import (
 from template_functions import TemplateFunctions
 
 
+@pytest.fixture(scope="session")
+def xdist_worker(request):
+    """
+    Name of the current pytest-xdist worker ("gw0", "gw1", ...).
+    Returns "master" when tests are not distributed, like pytest-xdist's own
+    worker_id fixture, which this does not shadow.
+    """
+    workerinput = getattr(request.config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else "master"
+
+
 @pytest.fixture
 def temp_workspace():
     """Provide a temporary directory for file operations."""
@@ -45,13 +51,18 @@ def temp_workspace_as_cwd():
             os.chdir(original_cwd)
 
 
-@pytest.fixture
-def template_functions(temp_workspace):
-    """Pre-configured TemplateFunctions instance."""
-    return TemplateFunctions(str(temp_workspace))
+@pytest.fixture(scope="module")
+def template_functions(tmp_path_factory):
+    """
+    Pre-configured TemplateFunctions instance, shared by a test module so
+    its file caches carry over between tests.
+    """
+    tf = TemplateFunctions(str(tmp_path_factory.mktemp("template-functions")))
+    yield tf
+    tf.clear_caches()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_csv_data():
     """Standard CSV test data for consistent testing."""
     return {
@@ -65,7 +76,7 @@ def sample_csv_data():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_json_data():
     """Standard JSON test data for consistent testing."""
     return {
@@ -89,7 +100,7 @@ def sample_json_data():
     }
 
 
-@pytest.fixture  
+@pytest.fixture(scope="session")
 def sample_yaml_data():
     """Standard YAML test data for consistent testing (same structure as JSON)."""
     return {
@@ -118,59 +129,101 @@ def sample_yaml_data():
     }
 
 
-@pytest.fixture
-def create_csv_file(temp_workspace, sample_csv_data):
-    """Create a sample CSV file for testing."""
+def _write_once(written: Dict, root: Path, key: Any, filename: str, write) -> str:
+    """Call write(path) the first time key is seen; return the file's path as a string."""
+    path = written.get(key)
+    if path is None:
+        # One directory per file so the requested filename is kept as-is
+        directory = root / f"file{len(written)}"
+        directory.mkdir()
+        path = directory / filename
+        write(path)
+        written[key] = path
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def create_csv_file(tmp_path_factory, sample_csv_data):
+    """
+    Create a sample CSV file for testing.
+    
+    Each distinct filename and content is written once per session and
+    shared between tests, so treat the files as read-only.
+    """
+    root = tmp_path_factory.mktemp("csv-data")
+    written = {}
+    
     def _create_csv(filename="test.csv", data=None):
         if data is None:
             data = sample_csv_data
         
-        csv_file = temp_workspace / filename
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(data['headers'])
-            writer.writerows(data['rows'])
+        def write(csv_file):
+            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(data['headers'])
+                writer.writerows(data['rows'])
         
-        return str(csv_file)
+        return _write_once(written, root, (filename, repr(data)), filename, write)
     
     return _create_csv
 
 
-@pytest.fixture
-def create_json_file(temp_workspace, sample_json_data):
-    """Create a sample JSON file for testing."""
+@pytest.fixture(scope="session")
+def create_json_file(tmp_path_factory, sample_json_data):
+    """
+    Create a sample JSON file for testing.
+    
+    Shared per session like create_csv_file; treat the files as read-only.
+    """
+    root = tmp_path_factory.mktemp("json-data")
+    written = {}
+    
     def _create_json(filename="test.json", data=None):
         if data is None:
             data = sample_json_data
         
-        json_file = temp_workspace / filename
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        def write(json_file):
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
         
-        return str(json_file)
+        return _write_once(written, root, (filename, repr(data)), filename, write)
     
     return _create_json
 
 
-@pytest.fixture
-def create_yaml_file(temp_workspace, sample_yaml_data):
-    """Create a sample YAML file for testing."""
+@pytest.fixture(scope="session")
+def create_yaml_file(tmp_path_factory, sample_yaml_data):
+    """
+    Create a sample YAML file for testing.
+    
+    Shared per session like create_csv_file; treat the files as read-only.
+    """
+    root = tmp_path_factory.mktemp("yaml-data")
+    written = {}
+    
     def _create_yaml(filename="test.yaml", data=None):
         if data is None:
             data = sample_yaml_data
         
-        yaml_file = temp_workspace / filename
-        with open(yaml_file, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, indent=2)
+        def write(yaml_file):
+            with open(yaml_file, 'w', encoding='utf-8') as f:
+                yaml.dump(data, f, default_flow_style=False, indent=2)
         
-        return str(yaml_file)
+        return _write_once(written, root, (filename, repr(data)), filename, write)
     
     return _create_yaml
 
 
-@pytest.fixture
-def create_text_file(temp_workspace):
-    """Create a sample text file for testing."""
+@pytest.fixture(scope="session")
+def create_text_file(tmp_path_factory):
+    """
+    Create a sample text file for testing.
+    
+    Shared per session like create_csv_file; treat the files as read-only.
+    """
+    root = tmp_path_factory.mktemp("text-data")
+    written = {}
+    
     def _create_text(filename="test.txt", lines=None):
         if lines is None:
             lines = [
@@ -181,10 +234,10 @@ def create_text_file(temp_workspace):
                 "Line 5 is the final line"
             ]
         
-        text_file = temp_workspace / filename
-        text_file.write_text('\n'.join(lines))
+        def write(text_file):
+            text_file.write_text('\n'.join(lines))
         
-        return str(text_file)
+        return _write_once(written, root, (filename, repr(lines)), filename, write)
     
     return _create_text
 
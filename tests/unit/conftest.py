@@ -0,0 +1,46 @@
+"""
+Shared pytest fixtures for the unit tests.
+"""
+import pytest
+
+from template_processor import TemplateProcessor
+
+
+# Serialized once; the pool contents never change between runs
+_ENTITY_POOL_JSON = (
+    b'{"entity1": ["Alice", "Bob", "Charlie", "Diana"], '
+    b'"entity2": ["London", "Paris", "Tokyo"], '
+    b'"colors": ["red", "blue", "green", "yellow"], '
+    b'"metals": ["gold", "silver", "copper"], '
+    b'"gems": ["ruby", "sapphire", "emerald"], '
+    b'"departments": ["engineering", "marketing", "sales", "hr"], '
+    b'"locations": ["headquarters", "branch_office", "remote", "datacenter"]}'
+)
+
+
+# TemplateProcessor keeps no per-template state beyond mtime-checked file
+# caches, so one workspace, pool and processor serve the whole session.
+@pytest.fixture(scope="session")
+def processor_workspace(tmp_path_factory):
+    """Temporary workspace shared by the TemplateProcessor tests."""
+    return tmp_path_factory.mktemp("tpi")
+
+
+@pytest.fixture(scope="session")
+def processor_base_dir(processor_workspace):
+    """The shared workspace as the base_dir string TemplateProcessor takes."""
+    return str(processor_workspace)
+
+
+@pytest.fixture(scope="session")
+def base_entity_pool_file(processor_workspace):
+    """Entity pool file holding every pool the TemplateProcessor tests refer to."""
+    pool_file = processor_workspace / "entity_pool.json"
+    pool_file.write_bytes(_ENTITY_POOL_JSON)
+    return str(pool_file)
+
+
+@pytest.fixture(scope="session")
+def shared_processor(base_entity_pool_file, processor_base_dir):
+    """TemplateProcessor over the shared workspace and entity pool."""
+    return TemplateProcessor(entity_pool_file=base_entity_pool_file, base_dir=processor_base_dir)
@@ -293,4 +293,26 @@ tests:
                 assert len(components) == 0
         
         # Clean up
-        os.unlink(config_file)
\ No newline at end of file
+        os.unlink(config_file)
+    
+    def test_template_functions_see_same_size_rewrite(self, minimal_entity_pool_file):
+        """
+        Test that a file rewritten between samples with the same size and
+        mtime is re-read rather than served from the shared file cache.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            generator = PrecheckGenerator(
+                entity_pool_file=minimal_entity_pool_file,
+                base_dir=temp_dir
+            )
+            data_file = Path(temp_dir) / "data.txt"
+            data_file.write_text("alpha\n")
+            stat = data_file.stat()
+            template = f"{{{{file_line:1:{data_file}}}}}"
+            
+            assert generator._evaluate_template_functions(template, 1, 1) == "alpha"
+            
+            data_file.write_text("omega\n")
+            os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            
+            assert generator._evaluate_template_functions(template, 1, 2) == "omega"
@@ -13,7 +13,14 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root / "src" / "scoring_types"))
 
-from response_cleaner import ResponseCleaner
+from response_cleaner import ResponseCleaner, _THINKING_TAG_RES
+
+
+def _strip_per_kind(text):
+    """Reference result: one regex pass per tag kind, in order."""
+    for pattern in _THINKING_TAG_RES:
+        text = pattern.sub('', text)
+    return text
 
 
 class TestResponseCleaner:
@@ -212,6 +219,24 @@ class TestResponseCleaner:
         assert "<reasoning>Unclosed reasoning tag." in result
         assert "<thought>Another unclosed tag." in result
     
+    def test_strip_thinking_tags_interleaved_kinds(self):
+        """Test that interleaved tags of different kinds are stripped one kind at a time."""
+        # <think> goes first, taking '<think>...</think>' with the <reflection>
+        # closing tag inside it; the leftover <reflection> then has no closing tag
+        text = "<reflection><THINK>final</reflection><|message|></THINK>Answer"
+        
+        result = ResponseCleaner.strip_thinking_tags(text)
+        
+        assert result == "<reflection>Answer"
+    
+    def test_strip_thinking_tags_mismatched_pair(self):
+        """Test that an opening tag is only closed by its own closing tag."""
+        text = "<thinking>Closed by the wrong tag.</reasoning> Answer"
+        
+        result = ResponseCleaner.strip_thinking_tags(text)
+        
+        assert result == text
+    
     def test_clean_response_thinking_only(self):
         """Test clean_response with only thinking tags."""
         text_with_thinking = """
@@ -340,6 +365,40 @@ class TestResponseCleaner:
         assert "</think>" not in result
         assert "<|channel|>final<|message|>" in result
     
+    @pytest.mark.parametrize("text", [
+        "",
+        "Plain answer",
+        "<thinking>Hidden</thinking>  Answer  ",
+        "Reasoning first</think>Answer",
+        "<|channel|>analysis<|message|>Thinking<|channel|>final<|message|> Answer ",
+        "<thinking>Ignored</thinking><|channel|>final<|message|>Harmony wins",
+    ])
+    def test_clean_response_with_flags_matches_separate_calls(self, text):
+        """Test that the combined helper agrees with the individual functions."""
+        assert ResponseCleaner.clean_response_with_flags(text) == (
+            ResponseCleaner.clean_response(text),
+            ResponseCleaner.has_thinking_tags(text),
+            ResponseCleaner.has_harmony_format(text),
+        )
+    
+    @pytest.mark.parametrize("text", [
+        "<thinking>Hidden</thinking>Answer",
+        "<THINKING>Upper</thinking><Think>Mixed</THINK>Answer",
+        "<reasoning>Unclosed <thought>inner</thought> tail",
+        "<think>a</think><think>b</think>Answer</think>",
+        "<x><thinking>nested <thinking>twice</thinking> rest</thinking>end",
+        "<thinking>Closed by the wrong tag.</reasoning> Answer",
+        "<reflection><THINK>final</reflection><|message|></THINK>Answer",
+        "<think>a<reasoning>b</think>c</reasoning>Answer",
+        "No tags at all < > </",
+    ])
+    def test_linear_scanner_matches_regex(self, text):
+        """Test that the find-based scanner for long ASCII text matches the per-kind regex passes."""
+        padded = text + " " * 4096
+        
+        assert ResponseCleaner._strip_thinking_tags_ascii(padded) == _strip_per_kind(padded)
+        assert ResponseCleaner.strip_thinking_tags(padded) == _strip_per_kind(padded)
+    
     def test_has_thinking_tags_true(self):
         """Test detection of thinking tags."""
         text_with_thinking = "Some text <thinking>internal thoughts</thinking> more text."
@@ -8,17 +8,22 @@ and end-to-end scoring pipeline integration.
 import pytest
 import tempfile
 import json
-import sys
-import os
+import pickle
 from pathlib import Path
-from datetime import datetime
-
-# Add src directory to Python path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "src"))
 
 from scorer import PicardScorer, ScoringResult, BaseScoringType
 
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    _dumps = lambda obj: json.dumps(obj).encode('utf-8')
+
+
+def _write_jsonl(path, entries):
+    """Write entries to a JSONL file in a single write."""
+    Path(path).write_bytes(b"\n".join(map(_dumps, entries)) + b"\n")
+
 
 class MockScoringType(BaseScoringType):
     """Mock scoring type for testing."""
@@ -40,6 +45,18 @@ class MockScoringType(BaseScoringType):
         )
 
 
+@pytest.fixture(scope="session")
+def scorer_root(tmp_path_factory, xdist_worker):
+    """Per-worker root directory shared by all scorer tests in the session."""
+    return tmp_path_factory.mktemp(f"scorer-{xdist_worker}")
+
+
+@pytest.fixture(scope="session")
+def mock_scoring_type():
+    """Stateless mock scoring type shared across the session."""
+    return MockScoringType(should_succeed=True)
+
+
 class TestScoringResult:
     """Test ScoringResult data structure."""
     
@@ -94,22 +111,46 @@ class TestScoringResult:
         assert result_dict['error_message'] is None
         assert result_dict['details']['expected']['key'] == 'value'
         assert 'timestamp' in result_dict
+    
+    def test_scoring_result_lazy_details(self):
+        """Test that a details builder runs once, on first access."""
+        calls = []
+        
+        def build_details():
+            calls.append(1)
+            return {'differences': ['value mismatch']}
+        
+        result = ScoringResult(104, 1, 'jsonmatch', False, details=build_details)
+        
+        assert calls == []
+        assert result.details['differences'] == ['value mismatch']
+        assert result.to_dict()['details'] == {'differences': ['value mismatch']}
+        assert calls == [1]
+    
+    def test_scoring_result_pickles_lazy_details(self):
+        """Test that results with lazy details survive pickling (used by parallel scoring)."""
+        result = ScoringResult(105, 2, 'jsonmatch', False, details=lambda: {'key': 'value'})
+        
+        restored = pickle.loads(pickle.dumps(result))
+        
+        assert restored.question_id == 105
+        assert restored.details == {'key': 'value'}
+        assert restored.timestamp == result.timestamp
 
 
 class TestPicardScorer:
     """Test PicardScorer orchestration functionality."""
     
     @pytest.fixture
-    def temp_base_dir(self):
+    def temp_base_dir(self, scorer_root):
         """Create temporary base directory for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            base_path = Path(temp_dir)
-            
-            # Create basic directory structure
-            (base_path / "results").mkdir()
-            (base_path / "test_artifacts").mkdir()
-            
-            yield base_path
+        base_path = Path(tempfile.mkdtemp(dir=scorer_root))
+        
+        # Create basic directory structure
+        (base_path / "results").mkdir()
+        (base_path / "test_artifacts").mkdir()
+        
+        return base_path
     
     @pytest.fixture
     def scorer(self, temp_base_dir):
@@ -192,6 +233,24 @@ class TestPicardScorer:
         
         assert scorer.validate_test_directory(test_dir) is False
     
+    def test_validate_test_directory_sees_new_files(self, scorer, temp_base_dir):
+        """Test that validation sees files added since the last check."""
+        test_dir = temp_base_dir / "results" / "test_20250101_120000"
+        test_dir.mkdir()
+        (test_dir / "precheck.jsonl").write_text("test content")
+        
+        assert scorer.validate_test_directory(test_dir) is False
+        
+        (test_dir / "responses.jsonl").write_text("test content")
+        
+        assert scorer.validate_test_directory(test_dir) is True
+    
+    def test_validate_test_directory_nonexistent(self, scorer, temp_base_dir):
+        """Test validating a test directory that does not exist."""
+        test_dir = temp_base_dir / "results" / "test_missing"
+        
+        assert scorer.validate_test_directory(test_dir) is False
+    
     def test_load_precheck_file(self, scorer, temp_base_dir):
         """Test loading precheck entries from JSONL file."""
         precheck_file = temp_base_dir / "precheck.jsonl"
@@ -202,9 +261,7 @@ class TestPicardScorer:
             {'question_id': 102, 'sample_number': 1, 'scoring_type': 'files_exist', 'files_to_check': ['test.txt']}
         ]
         
-        with open(precheck_file, 'w') as f:
-            for entry in precheck_data:
-                f.write(json.dumps(entry) + '\n')
+        _write_jsonl(precheck_file, precheck_data)
         
         loaded_entries = scorer.load_precheck_file(str(precheck_file))
         
@@ -228,6 +285,16 @@ class TestPicardScorer:
         assert loaded_entries[0]['question_id'] == 101
         assert loaded_entries[1]['question_id'] == 102
     
+    def test_load_precheck_file_skips_blank_lines(self, scorer, temp_base_dir):
+        """Test that blank lines in a precheck file are ignored."""
+        precheck_file = temp_base_dir / "precheck.jsonl"
+        precheck_file.write_text('{"question_id": 101, "sample_number": 1}\n\n   \n'
+                                 '{"question_id": 102, "sample_number": 1}\n')
+        
+        loaded_entries = scorer.load_precheck_file(str(precheck_file))
+        
+        assert [e['question_id'] for e in loaded_entries] == [101, 102]
+    
     def test_load_responses_file(self, scorer, temp_base_dir):
         """Test loading response entries from JSONL file."""
         responses_file = temp_base_dir / "responses.jsonl"
@@ -238,9 +305,7 @@ class TestPicardScorer:
             {'question_id': 102, 'sample_number': 1, 'response_text': 'World'}
         ]
         
-        with open(responses_file, 'w') as f:
-            for entry in response_data:
-                f.write(json.dumps(entry) + '\n')
+        _write_jsonl(responses_file, response_data)
         
         loaded_responses = scorer.load_responses_file(str(responses_file))
         
@@ -248,6 +313,18 @@ class TestPicardScorer:
         assert loaded_responses[0]['response_text'] == 'Hello'
         assert loaded_responses[1]['response_text'] == 'World'
     
+    def test_load_responses_file_accepts_what_json_accepts(self, scorer, temp_base_dir):
+        """Test that responses orjson cannot parse still load through stdlib json."""
+        responses_file = temp_base_dir / "responses.jsonl"
+        responses_file.write_text('{"question_id": 101, "sample_number": 1, "score": NaN}\n'
+                                  'invalid json line\n'
+                                  '{"question_id": 102, "sample_number": 1, "score": Infinity}\n')
+        
+        loaded_responses = scorer.load_responses_file(str(responses_file))
+        
+        assert [r['question_id'] for r in loaded_responses] == [101, 102]
+        assert loaded_responses[1]['score'] == float('inf')
+    
     def test_match_entries(self, scorer):
         """Test matching precheck entries with response entries."""
         precheck_entries = [
@@ -265,10 +342,12 @@ class TestPicardScorer:
         matched_pairs = scorer.match_entries(precheck_entries, response_entries)
         
         assert len(matched_pairs) == 2
-        assert matched_pairs[0][0]['question_id'] == 101
-        assert matched_pairs[0][1]['response_text'] == 'Response 1'
-        assert matched_pairs[1][0]['question_id'] == 102
-        assert matched_pairs[1][1]['response_text'] == 'Response 2'
+        assert matched_pairs[0][0] == (101, 1)
+        assert matched_pairs[0][1]['question_id'] == 101
+        assert matched_pairs[0][2]['response_text'] == 'Response 1'
+        assert matched_pairs[1][0] == (102, 1)
+        assert matched_pairs[1][1]['question_id'] == 102
+        assert matched_pairs[1][2]['response_text'] == 'Response 2'
     
     def test_score_single_entry_unknown_scoring_type(self, scorer):
         """Test scoring with unknown scoring type."""
@@ -290,10 +369,10 @@ class TestPicardScorer:
         assert "Unknown scoring type: unknown_type" in result.error_message
         assert result.scoring_type == 'unknown_type'
     
-    def test_score_single_entry_with_mock_scorer(self, scorer):
+    def test_score_single_entry_with_mock_scorer(self, scorer, mock_scoring_type):
         """Test scoring with a mock scoring type."""
         # Register mock scorer
-        scorer.scoring_types['mock'] = MockScoringType(should_succeed=True)
+        scorer.scoring_types['mock'] = mock_scoring_type
         
         precheck_entry = {
             'question_id': 101,
@@ -346,7 +425,7 @@ class TestPicardScorer:
         with pytest.raises(ValueError, match="Invalid test directory"):
             scorer.score_test_directory(test_dir)
     
-    def test_score_test_directory_valid(self, scorer, temp_base_dir):
+    def test_score_test_directory_valid(self, scorer, temp_base_dir, mock_scoring_type):
         """Test scoring a valid test directory."""
         # Create valid test directory
         test_dir = temp_base_dir / "results" / "test_20250101_120000"
@@ -356,20 +435,16 @@ class TestPicardScorer:
         precheck_data = [
             {'question_id': 101, 'sample_number': 1, 'scoring_type': 'mock', 'expected_response': 'Hello'}
         ]
-        with open(test_dir / "precheck.jsonl", 'w') as f:
-            for entry in precheck_data:
-                f.write(json.dumps(entry) + '\n')
+        _write_jsonl(test_dir / "precheck.jsonl", precheck_data)
         
         # Create responses file
         response_data = [
             {'question_id': 101, 'sample_number': 1, 'response_text': 'Hello'}
         ]
-        with open(test_dir / "responses.jsonl", 'w') as f:
-            for entry in response_data:
-                f.write(json.dumps(entry) + '\n')
+        _write_jsonl(test_dir / "responses.jsonl", response_data)
         
         # Register mock scorer
-        scorer.scoring_types['mock'] = MockScoringType(should_succeed=True)
+        scorer.scoring_types['mock'] = mock_scoring_type
         
         results = scorer.score_test_directory(test_dir)
         
@@ -422,63 +497,54 @@ class TestScorerIntegration:
     """Integration tests for scorer with multiple components."""
     
     @pytest.fixture
-    def full_test_setup(self):
+    def full_test_setup(self, scorer_root):
         """Create a complete test setup with multiple test directories."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            base_path = Path(temp_dir)
-            
-            # Create directory structure
-            results_dir = base_path / "results"
-            results_dir.mkdir()
-            artifacts_dir = base_path / "test_artifacts"
-            artifacts_dir.mkdir()
-            
-            # Create test directory 1
-            test_dir1 = results_dir / "test_20250101_120000"
-            test_dir1.mkdir()
-            
-            precheck1 = [
-                {'question_id': 101, 'sample_number': 1, 'scoring_type': 'mock', 'expected_response': 'Hello'},
-                {'question_id': 102, 'sample_number': 1, 'scoring_type': 'mock', 'expected_response': 'World'}
-            ]
-            with open(test_dir1 / "precheck.jsonl", 'w') as f:
-                for entry in precheck1:
-                    f.write(json.dumps(entry) + '\n')
-            
-            responses1 = [
-                {'question_id': 101, 'sample_number': 1, 'response_text': 'Hello'},
-                {'question_id': 102, 'sample_number': 1, 'response_text': 'Goodbye'}  # Wrong answer
-            ]
-            with open(test_dir1 / "responses.jsonl", 'w') as f:
-                for entry in responses1:
-                    f.write(json.dumps(entry) + '\n')
-            
-            # Create test directory 2
-            test_dir2 = results_dir / "test_20250102_130000"
-            test_dir2.mkdir()
-            
-            precheck2 = [
-                {'question_id': 201, 'sample_number': 1, 'scoring_type': 'mock', 'expected_response': 'Test'}
-            ]
-            with open(test_dir2 / "precheck.jsonl", 'w') as f:
-                for entry in precheck2:
-                    f.write(json.dumps(entry) + '\n')
-            
-            responses2 = [
-                {'question_id': 201, 'sample_number': 1, 'response_text': 'Test'}
-            ]
-            with open(test_dir2 / "responses.jsonl", 'w') as f:
-                for entry in responses2:
-                    f.write(json.dumps(entry) + '\n')
-            
-            yield base_path, test_dir1, test_dir2
-    
-    def test_score_all_tests(self, full_test_setup):
+        base_path = Path(tempfile.mkdtemp(dir=scorer_root))
+        
+        # Create directory structure
+        results_dir = base_path / "results"
+        results_dir.mkdir()
+        artifacts_dir = base_path / "test_artifacts"
+        artifacts_dir.mkdir()
+        
+        # Create test directory 1
+        test_dir1 = results_dir / "test_20250101_120000"
+        test_dir1.mkdir()
+        
+        precheck1 = [
+            {'question_id': 101, 'sample_number': 1, 'scoring_type': 'mock', 'expected_response': 'Hello'},
+            {'question_id': 102, 'sample_number': 1, 'scoring_type': 'mock', 'expected_response': 'World'}
+        ]
+        _write_jsonl(test_dir1 / "precheck.jsonl", precheck1)
+        
+        responses1 = [
+            {'question_id': 101, 'sample_number': 1, 'response_text': 'Hello'},
+            {'question_id': 102, 'sample_number': 1, 'response_text': 'Goodbye'}  # Wrong answer
+        ]
+        _write_jsonl(test_dir1 / "responses.jsonl", responses1)
+        
+        # Create test directory 2
+        test_dir2 = results_dir / "test_20250102_130000"
+        test_dir2.mkdir()
+        
+        precheck2 = [
+            {'question_id': 201, 'sample_number': 1, 'scoring_type': 'mock', 'expected_response': 'Test'}
+        ]
+        _write_jsonl(test_dir2 / "precheck.jsonl", precheck2)
+        
+        responses2 = [
+            {'question_id': 201, 'sample_number': 1, 'response_text': 'Test'}
+        ]
+        _write_jsonl(test_dir2 / "responses.jsonl", responses2)
+        
+        return base_path, test_dir1, test_dir2
+    
+    def test_score_all_tests(self, full_test_setup, mock_scoring_type):
         """Test scoring all test directories."""
         base_path, test_dir1, test_dir2 = full_test_setup
         
         scorer = PicardScorer(base_dir=str(base_path))
-        scorer.scoring_types['mock'] = MockScoringType(should_succeed=True)
+        scorer.scoring_types['mock'] = mock_scoring_type
         
         all_results = scorer.score_all_tests()
         
@@ -497,12 +563,31 @@ class TestScorerIntegration:
         assert len(results2) == 1
         assert results2[0].question_id == 201
     
-    def test_end_to_end_scoring_workflow(self, full_test_setup):
+    def test_score_all_tests_parallel(self, full_test_setup, mock_scoring_type, capsys):
+        """Test scoring all test directories across worker processes."""
+        base_path, test_dir1, test_dir2 = full_test_setup
+        
+        scorer = PicardScorer(base_dir=str(base_path))
+        scorer.scoring_types['mock'] = mock_scoring_type
+        
+        all_results = scorer.score_all_tests(max_workers=2)
+        
+        # Results keep directory order regardless of completion order
+        assert list(all_results) == ["test_20250101_120000", "test_20250102_130000"]
+        assert [r.question_id for r in all_results["test_20250101_120000"]] == [101, 102]
+        assert [r.question_id for r in all_results["test_20250102_130000"]] == [201]
+        
+        # Worker output is printed by the parent, one directory after the other
+        output = capsys.readouterr().out
+        assert output.index("Q102.1") < output.index("Completed scoring for test_20250101_120000")
+        assert output.index("Completed scoring for test_20250101_120000") < output.index("Q201.1")
+    
+    def test_end_to_end_scoring_workflow(self, full_test_setup, mock_scoring_type):
         """Test complete end-to-end scoring workflow."""
         base_path, test_dir1, test_dir2 = full_test_setup
         
         scorer = PicardScorer(base_dir=str(base_path))
-        scorer.scoring_types['mock'] = MockScoringType(should_succeed=True)
+        scorer.scoring_types['mock'] = mock_scoring_type
         
         # Test finding test directories
         test_dirs = scorer.find_test_directories()
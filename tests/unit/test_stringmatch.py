@@ -18,206 +18,120 @@ from scoring_types.stringmatch import StringMatchScorer
 from scorer import ScoringResult
 
 
-class TestStringMatchScorer:
-    """Test the StringMatchScorer implementation."""
-    
-    @pytest.fixture
-    def scorer(self):
-        """Create StringMatchScorer instance for testing."""
-        return StringMatchScorer()
-    
-    @pytest.fixture
-    def test_artifacts_dir(self, tmp_path):
-        """Create temporary test artifacts directory."""
-        return tmp_path / "test_artifacts"
-    
-    def test_exact_match_success(self, scorer, test_artifacts_dir):
-        """Test successful exact string match."""
-        precheck_entry = {
-            'question_id': 101,
-            'sample_number': 1,
-            'expected_response': 'Hello World'
-        }
-        
-        response_entry = {
-            'question_id': 101,
-            'sample_number': 1,
-            'response_text': 'Hello World'
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert isinstance(result, ScoringResult)
-        assert result.question_id == 101
-        assert result.sample_number == 1
-        assert result.scoring_type == 'stringmatch'
-        assert result.correct is True
-        assert result.error_message is None
-        
-        # Check details
-        assert result.details['expected'] == 'Hello World'
-        assert result.details['actual_cleaned'] == 'Hello World'
-        assert result.details['comparison_method'] == 'exact_match_trimmed_cleaned'
-    
-    def test_exact_match_failure(self, scorer, test_artifacts_dir):
-        """Test failed exact string match."""
-        precheck_entry = {
-            'question_id': 102,
-            'sample_number': 1,
-            'expected_response': 'Expected Answer'
-        }
-        
-        response_entry = {
-            'question_id': 102,
-            'sample_number': 1,
-            'response_text': 'Different Answer'
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is False
-        assert result.error_message == "Expected 'Expected Answer', got 'Different Answer'"
-        
-        # Check details
-        assert result.details['expected'] == 'Expected Answer'
-        assert result.details['actual_cleaned'] == 'Different Answer'
-        assert result.details['actual_raw'] == 'Different Answer'
-    
-    def test_whitespace_trimming(self, scorer, test_artifacts_dir):
-        """Test that whitespace is properly trimmed for matching."""
-        precheck_entry = {
-            'question_id': 103,
-            'sample_number': 1,
-            'expected_response': '  Trimmed Answer  '
-        }
-        
-        response_entry = {
-            'question_id': 103,
-            'sample_number': 1,
-            'response_text': '   Trimmed Answer   '
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is True
-        assert result.details['expected'] == 'Trimmed Answer'  # Should be trimmed
-        assert result.details['actual_cleaned'] == 'Trimmed Answer'  # Should be trimmed
-    
-    def test_thinking_tags_removal(self, scorer, test_artifacts_dir):
-        """Test that thinking tags are properly removed from responses."""
-        precheck_entry = {
-            'question_id': 104,
-            'sample_number': 1,
-            'expected_response': 'The answer is 42'
-        }
-        
-        response_entry = {
-            'question_id': 104,
-            'sample_number': 1,
-            'response_text': '''
+def _entries(question_id, expected_response, response_text):
+    """Build a matching precheck/response entry pair for sample 1."""
+    return (
+        {'question_id': question_id, 'sample_number': 1, 'expected_response': expected_response},
+        {'question_id': question_id, 'sample_number': 1, 'response_text': response_text}
+    )
+
+
+@pytest.fixture(scope="module")
+def scorer():
+    """Create StringMatchScorer instance shared by the module (score() is stateless)."""
+    return StringMatchScorer()
+
+
+@pytest.fixture(scope="module")
+def test_artifacts_dir():
+    """Artifacts path placeholder; stringmatch never touches the filesystem."""
+    return Path("/nonexistent/test_artifacts")
+
+
+# (expected_response, response_text, correct, expected_trimmed, actual_cleaned,
+#  thinking_tags_found, harmony_format_found)
+SCORE_CASES = [
+    pytest.param('Hello World', 'Hello World',
+                 True, 'Hello World', 'Hello World', False, False,
+                 id='exact_match_success'),
+    pytest.param('Expected Answer', 'Different Answer',
+                 False, 'Expected Answer', 'Different Answer', False, False,
+                 id='exact_match_failure'),
+    pytest.param('  Trimmed Answer  ', '   Trimmed Answer   ',
+                 True, 'Trimmed Answer', 'Trimmed Answer', False, False,
+                 id='whitespace_trimming'),
+    pytest.param('The answer is 42', '''
             <thinking>
             Let me think about this problem.
             The user is asking for a specific answer.
             I should respond with 42.
             </thinking>
             The answer is 42
-            '''
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is True
-        assert result.details['thinking_tags_found'] is True
-        assert result.details['actual_cleaned'] == 'The answer is 42'
-        assert '<thinking>' not in result.details['actual_cleaned']
-    
-    def test_harmony_format_processing(self, scorer, test_artifacts_dir):
-        """Test that OpenAI Harmony format is properly processed."""
-        precheck_entry = {
-            'question_id': 105,
-            'sample_number': 1,
-            'expected_response': 'Final answer here'
-        }
-        
-        response_entry = {
-            'question_id': 105,
-            'sample_number': 1,
-            'response_text': '''
+            ''',
+                 True, 'The answer is 42', 'The answer is 42', True, False,
+                 id='thinking_tags_removal'),
+    pytest.param('Final answer here', '''
             <|channel|>analysis<|message|>Let me analyze this question.
             The user wants a specific response.
             <|channel|>final<|message|>Final answer here
-            '''
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is True
-        assert result.details['harmony_format_found'] is True
-        assert result.details['actual_cleaned'] == 'Final answer here'
-    
-    def test_multiple_thinking_tag_types(self, scorer, test_artifacts_dir):
-        """Test removal of various thinking tag types."""
-        precheck_entry = {
-            'question_id': 106,
-            'sample_number': 1,
-            'expected_response': 'Clean answer'
-        }
-        
-        response_entry = {
-            'question_id': 106,
-            'sample_number': 1,
-            'response_text': '''
+            ''',
+                 True, 'Final answer here', 'Final answer here', False, True,
+                 id='harmony_format_processing'),
+    pytest.param('Clean answer', '''
             <thinking>First thought process.</thinking>
             <reasoning>Logical reasoning here.</reasoning>
             Clean answer
             <reflection>Post-answer reflection.</reflection>
-            '''
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is True
-        assert result.details['thinking_tags_found'] is True
-        assert result.details['actual_cleaned'] == 'Clean answer'
-    
-    def test_case_sensitive_matching(self, scorer, test_artifacts_dir):
-        """Test that string matching is case-sensitive."""
-        precheck_entry = {
-            'question_id': 107,
-            'sample_number': 1,
-            'expected_response': 'Hello World'
-        }
-        
-        response_entry = {
-            'question_id': 107,
-            'sample_number': 1,
-            'response_text': 'hello world'  # Different case
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is False
-        assert result.error_message == "Expected 'Hello World', got 'hello world'"
+            ''',
+                 True, 'Clean answer', 'Clean answer', True, False,
+                 id='multiple_thinking_tag_types'),
+    pytest.param('Hello World', 'hello world',
+                 False, 'Hello World', 'hello world', False, False,
+                 id='case_sensitive_matching'),
+    pytest.param('', '',
+                 True, '', '', False, False,
+                 id='empty_expected_response'),
+    pytest.param('Line 1\nLine 2\nLine 3',
+                 '<thinking>Processing multiline response.</thinking>\nLine 1\nLine 2\nLine 3',
+                 True, 'Line 1\nLine 2\nLine 3', 'Line 1\nLine 2\nLine 3', True, False,
+                 id='complex_multiline_content'),
+    pytest.param('Special chars: α β γ 🎉 你好', 'Special chars: α β γ 🎉 你好',
+                 True, 'Special chars: α β γ 🎉 你好', 'Special chars: α β γ 🎉 你好', False, False,
+                 id='unicode_and_special_characters'),
+    pytest.param('Answer', 'Answer',
+                 True, 'Answer', 'Answer', False, False,
+                 id='thinking_tags_without_content_change'),
+    pytest.param('Answer', '<|channel|>final<|message|>Answer',
+                 True, 'Answer', 'Answer', False, True,
+                 id='harmony_format_detection'),
+    pytest.param('', '   \n\t  ',
+                 True, '', '', False, False,
+                 id='edge_case_exact_match_with_only_whitespace'),
+]
+
+
+class TestStringMatchScorer:
+    """Test the StringMatchScorer implementation."""
     
-    def test_empty_expected_response(self, scorer, test_artifacts_dir):
-        """Test handling of empty expected response."""
-        precheck_entry = {
-            'question_id': 108,
-            'sample_number': 1,
-            'expected_response': ''
-        }
-        
-        response_entry = {
-            'question_id': 108,
-            'sample_number': 1,
-            'response_text': ''
-        }
+    @pytest.mark.parametrize(
+        "expected_response, response_text, correct, expected_trimmed, actual_cleaned, "
+        "thinking_tags_found, harmony_format_found",
+        SCORE_CASES
+    )
+    def test_score_cases(self, scorer, test_artifacts_dir, expected_response, response_text,
+                         correct, expected_trimmed, actual_cleaned,
+                         thinking_tags_found, harmony_format_found):
+        """Test matching, cleaning and format detection across response shapes."""
+        precheck_entry, response_entry = _entries(101, expected_response, response_text)
         
         result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
         
-        assert result.correct is True
-        assert result.details['expected'] == ''
-        assert result.details['actual_cleaned'] == ''
+        assert isinstance(result, ScoringResult)
+        assert result.question_id == 101
+        assert result.sample_number == 1
+        assert result.scoring_type == 'stringmatch'
+        assert result.correct is correct
+        if correct:
+            assert result.error_message is None
+        else:
+            assert result.error_message == f"Expected '{expected_trimmed}', got '{actual_cleaned}'"
+        
+        assert result.details['expected'] == expected_trimmed
+        assert result.details['actual_raw'] == response_text
+        assert result.details['actual_cleaned'] == actual_cleaned
+        assert result.details['comparison_method'] == 'exact_match_trimmed_cleaned'
+        assert result.details['thinking_tags_found'] is thinking_tags_found
+        assert result.details['harmony_format_found'] is harmony_format_found
     
     def test_missing_expected_response_field(self, scorer, test_artifacts_dir):
         """Test handling when expected_response field is missing."""
@@ -260,129 +174,9 @@ class TestStringMatchScorer:
         assert result.details['actual_raw'] == ''  # Should default to empty string
         assert result.details['actual_cleaned'] == ''
     
-    def test_complex_multiline_content(self, scorer, test_artifacts_dir):
-        """Test matching of complex multiline content."""
-        expected_multiline = """Line 1
-Line 2
-Line 3"""
-        
-        response_multiline = """<thinking>Processing multiline response.</thinking>
-Line 1
-Line 2
-Line 3"""
-        
-        precheck_entry = {
-            'question_id': 111,
-            'sample_number': 1,
-            'expected_response': expected_multiline
-        }
-        
-        response_entry = {
-            'question_id': 111,
-            'sample_number': 1,
-            'response_text': response_multiline
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is True
-        assert result.details['thinking_tags_found'] is True
-        assert result.details['actual_cleaned'] == expected_multiline
-    
-    def test_unicode_and_special_characters(self, scorer, test_artifacts_dir):
-        """Test matching with Unicode and special characters."""
-        unicode_text = "Special chars: α β γ 🎉 你好"
-        
-        precheck_entry = {
-            'question_id': 112,
-            'sample_number': 1,
-            'expected_response': unicode_text
-        }
-        
-        response_entry = {
-            'question_id': 112,
-            'sample_number': 1,
-            'response_text': unicode_text
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is True
-        assert result.details['actual_cleaned'] == unicode_text
-    
-    def test_thinking_tags_without_content_change(self, scorer, test_artifacts_dir):
-        """Test that thinking tag detection works even when content doesn't change."""
-        precheck_entry = {
-            'question_id': 113,
-            'sample_number': 1,
-            'expected_response': 'Answer'
-        }
-        
-        response_entry = {
-            'question_id': 113,
-            'sample_number': 1,
-            'response_text': 'Answer'  # No thinking tags
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is True
-        assert result.details['thinking_tags_found'] is False
-        assert result.details['harmony_format_found'] is False
-    
-    def test_harmony_format_detection(self, scorer, test_artifacts_dir):
-        """Test proper detection of Harmony format vs regular responses."""
-        # Test with Harmony format
-        precheck_entry = {
-            'question_id': 114,
-            'sample_number': 1,
-            'expected_response': 'Answer'
-        }
-        
-        harmony_response = {
-            'question_id': 114,
-            'sample_number': 1,
-            'response_text': '<|channel|>final<|message|>Answer'
-        }
-        
-        result = scorer.score(precheck_entry, harmony_response, test_artifacts_dir)
-        
-        assert result.correct is True
-        assert result.details['harmony_format_found'] is True
-        assert result.details['thinking_tags_found'] is False  # Should be False for Harmony
-    
-    def test_edge_case_exact_match_with_only_whitespace(self, scorer, test_artifacts_dir):
-        """Test edge case where response is only whitespace."""
-        precheck_entry = {
-            'question_id': 115,
-            'sample_number': 1,
-            'expected_response': ''
-        }
-        
-        response_entry = {
-            'question_id': 115,
-            'sample_number': 1,
-            'response_text': '   \n\t  '  # Only whitespace
-        }
-        
-        result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
-        
-        assert result.correct is True  # Whitespace should be trimmed to empty string
-        assert result.details['actual_cleaned'] == ''
-    
     def test_details_structure_completeness(self, scorer, test_artifacts_dir):
         """Test that all expected details are included in the result."""
-        precheck_entry = {
-            'question_id': 116,
-            'sample_number': 1,
-            'expected_response': 'Test'
-        }
-        
-        response_entry = {
-            'question_id': 116,
-            'sample_number': 1,
-            'response_text': '<thinking>Thoughts</thinking>Test'
-        }
+        precheck_entry, response_entry = _entries(116, 'Test', '<thinking>Thoughts</thinking>Test')
         
         result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
         
@@ -405,28 +199,9 @@ Line 3"""
 class TestStringMatchScorerIntegration:
     """Integration tests for StringMatchScorer with various response formats."""
     
-    @pytest.fixture
-    def scorer(self):
-        """Create StringMatchScorer instance for testing."""
-        return StringMatchScorer()
-    
-    @pytest.fixture
-    def test_artifacts_dir(self, tmp_path):
-        """Create temporary test artifacts directory."""
-        return tmp_path / "test_artifacts"
-    
     def test_real_world_chatbot_response(self, scorer, test_artifacts_dir):
         """Test with realistic chatbot response including thinking tags."""
-        precheck_entry = {
-            'question_id': 201,
-            'sample_number': 1,
-            'expected_response': 'The capital of France is Paris.'
-        }
-        
-        response_entry = {
-            'question_id': 201,
-            'sample_number': 1,
-            'response_text': '''
+        precheck_entry, response_entry = _entries(201, 'The capital of France is Paris.', '''
             <thinking>
             The user is asking about the capital of France. This is a straightforward 
             geography question. The capital of France is Paris, which is well-known.
@@ -434,8 +209,7 @@ class TestStringMatchScorerIntegration:
             </thinking>
             
             The capital of France is Paris.
-            '''
-        }
+            ''')
         
         result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
         
@@ -445,22 +219,12 @@ class TestStringMatchScorerIntegration:
     
     def test_real_world_harmony_response(self, scorer, test_artifacts_dir):
         """Test with realistic OpenAI Harmony format response."""
-        precheck_entry = {
-            'question_id': 202,
-            'sample_number': 1,
-            'expected_response': 'I can help you with that task.'
-        }
-        
-        response_entry = {
-            'question_id': 202,
-            'sample_number': 1,
-            'response_text': '''
+        precheck_entry, response_entry = _entries(202, 'I can help you with that task.', '''
             <|channel|>analysis<|message|>The user is asking for help with a task.
             This seems like a reasonable request that I can assist with.
             I should provide a helpful and positive response.
             <|start|>assistant<|channel|>final<|message|>I can help you with that task.
-            '''
-        }
+            ''')
         
         result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
         
@@ -470,22 +234,12 @@ class TestStringMatchScorerIntegration:
     
     def test_mixed_format_edge_case(self, scorer, test_artifacts_dir):
         """Test edge case with both thinking tags and Harmony markers (Harmony should win)."""
-        precheck_entry = {
-            'question_id': 203,
-            'sample_number': 1,
-            'expected_response': 'Harmony wins'
-        }
-        
-        response_entry = {
-            'question_id': 203,
-            'sample_number': 1,
-            'response_text': '''
+        precheck_entry, response_entry = _entries(203, 'Harmony wins', '''
             <thinking>This thinking should be ignored due to Harmony format.</thinking>
             <|channel|>analysis<|message|>Analyzing the request.
             <thinking>Even this thinking should be ignored.</thinking>
             <|channel|>final<|message|>Harmony wins
-            '''
-        }
+            ''')
         
         result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
         
@@ -500,17 +254,7 @@ class TestStringMatchScorerIntegration:
         large_thinking = "<thinking>" + "Large content. " * 1000 + "</thinking>"
         large_response_text = large_thinking + "\nSimple answer."
         
-        precheck_entry = {
-            'question_id': 204,
-            'sample_number': 1,
-            'expected_response': 'Simple answer.'
-        }
-        
-        response_entry = {
-            'question_id': 204,
-            'sample_number': 1,
-            'response_text': large_response_text
-        }
+        precheck_entry, response_entry = _entries(204, 'Simple answer.', large_response_text)
         
         result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
         
@@ -529,17 +273,7 @@ hello()
 
 Output: Hello, World!'''
         
-        precheck_entry = {
-            'question_id': 205,
-            'sample_number': 1,
-            'expected_response': code_output
-        }
-        
-        response_entry = {
-            'question_id': 205,
-            'sample_number': 1,
-            'response_text': f'<reasoning>User wants code example.</reasoning>\n{code_output}'
-        }
+        precheck_entry, response_entry = _entries(205, code_output, f'<reasoning>User wants code example.</reasoning>\n{code_output}')
         
         result = scorer.score(precheck_entry, response_entry, test_artifacts_dir)
         
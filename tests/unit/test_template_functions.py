@@ -4,11 +4,12 @@ Unit tests for TemplateFunctions.
 Migrated from the main() function in src/template_functions.py
 """
 import pytest
-import json
 import csv
+import os
 import sqlite3
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 # Add src directory to Python path for imports
 project_root = Path(__file__).parent.parent.parent
@@ -76,96 +77,125 @@ class TestFileTemplateFunctions:
         with pytest.raises(TemplateFunctionError, match="Word number 10 out of range"):
             template_functions.evaluate_all_functions(f"{{{{file_word:10:{text_file}}}}}")
 
+    def test_file_line_mmap_path(self, template_functions, temp_workspace, monkeypatch):
+        """Test that file_line gives the same results when reading lines through mmap."""
+        monkeypatch.setattr("template_functions._MMAP_LINE_MIN_SIZE", 1)
+        text_file = temp_workspace / "large.txt"
+        text_file.write_bytes("First\nSécond\n\nLast\n".encode("utf-8"))
+        crlf_file = temp_workspace / "crlf.txt"
+        crlf_file.write_bytes(b"One\r\nTwo\r\n")
+
+        assert template_functions.evaluate_all_functions(f"{{{{file_line:1:{text_file}}}}}") == "First"
+        assert template_functions.evaluate_all_functions(f"{{{{file_line:2:{text_file}}}}}") == "Sécond"
+        assert template_functions.evaluate_all_functions(f"{{{{file_line:3:{text_file}}}}}") == ""
+        assert template_functions.evaluate_all_functions(f"{{{{file_line:4:{text_file}}}}}") == "Last"
+        assert template_functions.evaluate_all_functions(f"{{{{file_line:2:{crlf_file}}}}}") == "Two"
+
+        with pytest.raises(TemplateFunctionError, match="Line number 5 out of range \\(file has 4 lines\\)"):
+            template_functions.evaluate_all_functions(f"{{{{file_line:5:{text_file}}}}}")
+
+    def test_file_line_mmap_path_invalid_utf8_elsewhere(self, template_functions, temp_workspace, monkeypatch):
+        """Test that file_line fails like file_line_count when another line is not UTF-8."""
+        monkeypatch.setattr("template_functions._MMAP_LINE_MIN_SIZE", 1)
+        monkeypatch.setattr("template_functions._MMAP_CHUNK_SIZE", 3)
+        bad_file = temp_workspace / "bad_line.txt"
+        bad_file.write_bytes(b"One\nTwo\n\xff\n")
+
+        with pytest.raises(TemplateFunctionError, match="Error reading file"):
+            template_functions.evaluate_all_functions(f"{{{{file_line:1:{bad_file}}}}}")
+        with pytest.raises(TemplateFunctionError, match="Error reading file"):
+            template_functions.evaluate_all_functions(f"{{{{file_line_count:{bad_file}}}}}")
+
+    def test_file_line_count_mmap_path(self, template_functions, temp_workspace, monkeypatch):
+        """Test that file_line_count gives the same results when counting through mmap."""
+        monkeypatch.setattr("template_functions._MMAP_LINE_MIN_SIZE", 1)
+        monkeypatch.setattr("template_functions._MMAP_CHUNK_SIZE", 3)
+        cases = {
+            "trailing.txt": "First\nSécond\n\nLast\n".encode("utf-8"),
+            "no_trailing.txt": b"One\nTwo",
+            "crlf_count.txt": b"One\r\nTwo\r\n",
+        }
+        for name, content in cases.items():
+            (temp_workspace / name).write_bytes(content)
+
+        for name, expected in [("trailing.txt", "4"), ("no_trailing.txt", "2"), ("crlf_count.txt", "2")]:
+            text_file = temp_workspace / name
+            assert template_functions.evaluate_all_functions(f"{{{{file_line_count:{text_file}}}}}") == expected
+
+        bad_file = temp_workspace / "bad.txt"
+        bad_file.write_bytes(b"One\n\xff\n")
+        with pytest.raises(TemplateFunctionError, match="Error reading file"):
+            template_functions.evaluate_all_functions(f"{{{{file_line_count:{bad_file}}}}}")
+
+
+# Cases for the shared sample CSV (see sample_csv_data); FILE is replaced
+# by the file's path
+CSV_FUNCTION_CASES = (
+    # Cells are 0-indexed: row 1, column 1 (name) and row 2, column 2 (age)
+    ("{{csv_cell:1:1:FILE}}", "John Doe"),
+    ("{{csv_cell:2:2:FILE}}", "30"),
+    ("{{csv_row:1:FILE}}", "1,John Doe,25,New York,active"),
+    ("{{csv_column:name:FILE}}", "John Doe,Jane Smith,Bob Johnson,Alice Brown"),
+    ("{{csv_column:age:FILE}}", "25,30,35,28"),
+    ("{{csv_value:0:name:FILE}}", "John Doe"),
+    ("{{csv_value:2:city:FILE}}", "Chicago"),
+    # Sum ages: 25+30+35+28 = 118, average 118/4 = 29.5
+    ("{{csv_sum:age:FILE}}", "118.0"),
+    ("{{csv_avg:age:FILE}}", "29.5"),
+    # Count names (non-empty values)
+    ("{{csv_count:name:FILE}}", "4"),
+    # Ages where status is active (John: 25, Bob: 35, Alice: 28 = 88)
+    ("{{csv_sum_where:age:status:==:active:FILE}}", "88.0"),
+    ("{{csv_count_where:name:status:==:active:FILE}}", "3"),
+)
+
+CSV_FUNCTION_ERROR_CASES = (
+    ("{{csv_column:nonexistent:FILE}}", "Header 'nonexistent' not found"),
+    ("{{csv_cell:10:0:FILE}}", "Row 10 out of range"),
+)
+
 
 @pytest.mark.unit
 @pytest.mark.template_functions
 class TestCSVTemplateFunctions:
     """Test CSV extraction functions."""
     
-    def test_csv_cell_extraction(self, template_functions, create_csv_file):
-        """Test {{csv_cell:row:column:path}} function."""
+    @pytest.mark.parametrize("template,expected", CSV_FUNCTION_CASES)
+    def test_csv_functions(self, template_functions, create_csv_file, template, expected):
+        """Test CSV extraction and aggregation functions against the shared sample CSV."""
         csv_file = create_csv_file("test.csv")
         
-        # Extract specific cells (0-indexed)
-        result = template_functions.evaluate_all_functions(f"{{{{csv_cell:1:1:{csv_file}}}}}")
-        assert result == "John Doe"  # Row 1, Column 1 (name)
-        
-        result = template_functions.evaluate_all_functions(f"{{{{csv_cell:2:2:{csv_file}}}}}")
-        assert result == "30"  # Row 2, Column 2 (age)
+        result = template_functions.evaluate_all_functions(template.replace("FILE", csv_file))
+        assert result == expected
     
-    def test_csv_row_extraction(self, template_functions, create_csv_file):
-        """Test {{csv_row:N:path}} function."""
+    def test_csv_avg_where(self, template_functions, create_csv_file):
+        """Test {{csv_avg_where:...}}, whose result is not an exact float."""
         csv_file = create_csv_file("test.csv")
         
-        # Extract entire row
-        result = template_functions.evaluate_all_functions(f"{{{{csv_row:1:{csv_file}}}}}")
-        assert result == "1,John Doe,25,New York,active"
-    
-    def test_csv_column_extraction(self, template_functions, create_csv_file):
-        """Test {{csv_column:header:path}} function."""
-        csv_file = create_csv_file("test.csv")
-        
-        # Extract entire column by header
-        result = template_functions.evaluate_all_functions(f"{{{{csv_column:name:{csv_file}}}}}")
-        assert result == "John Doe,Jane Smith,Bob Johnson,Alice Brown"
-        
-        result = template_functions.evaluate_all_functions(f"{{{{csv_column:age:{csv_file}}}}}")
-        assert result == "25,30,35,28"
-    
-    def test_csv_value_extraction(self, template_functions, create_csv_file):
-        """Test {{csv_value:row:header:path}} function."""
-        csv_file = create_csv_file("test.csv")
-        
-        # Extract by row and column header
-        result = template_functions.evaluate_all_functions(f"{{{{csv_value:0:name:{csv_file}}}}}")
-        assert result == "John Doe"
-        
-        result = template_functions.evaluate_all_functions(f"{{{{csv_value:2:city:{csv_file}}}}}")
-        assert result == "Chicago"
-    
-    def test_csv_aggregation_functions(self, template_functions, create_csv_file):
-        """Test CSV aggregation functions (sum, avg, count)."""
-        csv_file = create_csv_file("test.csv")
-        
-        # Sum ages: 25+30+35+28 = 118
-        result = template_functions.evaluate_all_functions(f"{{{{csv_sum:age:{csv_file}}}}}")
-        assert result == "118.0"
-        
-        # Average age: 118/4 = 29.5
-        result = template_functions.evaluate_all_functions(f"{{{{csv_avg:age:{csv_file}}}}}")
-        assert result == "29.5"
-        
-        # Count names (non-empty values)
-        result = template_functions.evaluate_all_functions(f"{{{{csv_count:name:{csv_file}}}}}")
-        assert result == "4"
-    
-    def test_csv_filtered_aggregation(self, template_functions, create_csv_file):
-        """Test CSV filtered aggregation functions."""
-        csv_file = create_csv_file("test.csv")
-        
-        # Sum ages where status is active (John: 25, Bob: 35, Alice: 28 = 88)
-        result = template_functions.evaluate_all_functions(f"{{{{csv_sum_where:age:status:==:active:{csv_file}}}}}")
-        assert result == "88.0"
-        
         # Average age where status is active: 88/3 = 29.33...
         result = template_functions.evaluate_all_functions(f"{{{{csv_avg_where:age:status:==:active:{csv_file}}}}}")
-        assert float(result) == pytest.approx(29.33, abs=0.1)
-        
-        # Count people where status contains 'active'
-        result = template_functions.evaluate_all_functions(f"{{{{csv_count_where:name:status:==:active:{csv_file}}}}}")
-        assert result == "3"
+        assert round(float(result), 2) == 29.33
     
-    def test_csv_function_errors(self, template_functions, create_csv_file):
-        """Test error handling for CSV functions.""" 
+    @pytest.mark.parametrize("template,error", CSV_FUNCTION_ERROR_CASES)
+    def test_csv_function_errors(self, template_functions, create_csv_file, template, error):
+        """Test error handling for CSV functions."""
         csv_file = create_csv_file("test.csv")
         
-        # Invalid column header
-        with pytest.raises(TemplateFunctionError, match="Header 'nonexistent' not found"):
-            template_functions.evaluate_all_functions(f"{{{{csv_column:nonexistent:{csv_file}}}}}")
-        
-        # Row out of range
-        with pytest.raises(TemplateFunctionError, match="Row 10 out of range"):
-            template_functions.evaluate_all_functions(f"{{{{csv_cell:10:0:{csv_file}}}}}")
+        with pytest.raises(TemplateFunctionError, match=error):
+            template_functions.evaluate_all_functions(template.replace("FILE", csv_file))
+
+    def test_csv_reloads_modified_file(self, template_functions, temp_workspace):
+        """Test that cached CSV data is dropped when the file changes."""
+        # Written by hand: files from create_csv_file are shared and read-only
+        csv_file = temp_workspace / "modified.csv"
+        csv_file.write_text("name\nJohn\nJane\n")
+        assert template_functions.evaluate_all_functions(f"{{{{csv_count:name:{csv_file}}}}}") == "2"
+
+        assert template_functions.evaluate_all_functions(f"{{{{csv_column:name:{csv_file}}}}}") == "John,Jane"
+
+        csv_file.write_text("name\nOnly One\n")
+        assert template_functions.evaluate_all_functions(f"{{{{csv_count:name:{csv_file}}}}}") == "1"
+        assert template_functions.evaluate_all_functions(f"{{{{csv_column:name:{csv_file}}}}}") == "Only One"
 
 
 @pytest.mark.unit
@@ -240,7 +270,7 @@ class TestJSONTemplateFunctions:
         with pytest.raises(TemplateFunctionError, match="Array index 10 out of range"):
             template_functions.evaluate_all_functions(f"{{{{json_path:$.users[10].name:{json_file}}}}}")
     
-    def test_json_aggregation_functions(self, template_functions, temp_workspace):
+    def test_json_aggregation_functions(self, template_functions, create_json_file):
         """Test new JSON aggregation functions: sum, avg, max, min."""
         # Create test JSON with numeric data
         test_data = {
@@ -255,31 +285,20 @@ class TestJSONTemplateFunctions:
             ]
         }
         
-        json_file = temp_workspace / "aggregation_test.json"
-        with open(json_file, 'w') as f:
-            json.dump(test_data, f)
-        
-        # Test json_sum
-        result = template_functions.evaluate_all_functions(f"{{{{json_sum:$.projects[*].budget:{json_file}}}}}")
-        assert result == "150000.0"  # 50000 + 75000 + 25000
-        
-        # Test json_avg
-        result = template_functions.evaluate_all_functions(f"{{{{json_avg:$.projects[*].budget:{json_file}}}}}")
-        assert result == "50000.0"  # 150000 / 3
+        json_file = create_json_file("aggregation_test.json", test_data)
         
-        # Test json_max
-        result = template_functions.evaluate_all_functions(f"{{{{json_max:$.projects[*].budget:{json_file}}}}}")
-        assert result == "75000.0"
-        
-        # Test json_min
-        result = template_functions.evaluate_all_functions(f"{{{{json_min:$.projects[*].budget:{json_file}}}}}")
-        assert result == "25000.0"
-        
-        # Test with different field
-        result = template_functions.evaluate_all_functions(f"{{{{json_sum:$.projects[*].team_size:{json_file}}}}}")
-        assert result == "16.0"  # 5 + 3 + 8
+        # One template evaluates every aggregation against the same file
+        result = template_functions.evaluate_all_functions(
+            f"sum={{{{json_sum:$.projects[*].budget:{json_file}}}}};"
+            f"avg={{{{json_avg:$.projects[*].budget:{json_file}}}}};"
+            f"max={{{{json_max:$.projects[*].budget:{json_file}}}}};"
+            f"min={{{{json_min:$.projects[*].budget:{json_file}}}}};"
+            f"team={{{{json_sum:$.projects[*].team_size:{json_file}}}}}"
+        )
+        # Budgets 50000 + 75000 + 25000 = 150000 (average 50000); team sizes 5 + 3 + 8
+        assert result == "sum=150000.0;avg=50000.0;max=75000.0;min=25000.0;team=16.0"
     
-    def test_json_collection_functions(self, template_functions, temp_workspace):
+    def test_json_collection_functions(self, template_functions, create_json_file):
         """Test json_collect function for gathering values."""
         test_data = {
             "teams": [
@@ -293,23 +312,21 @@ class TestJSONTemplateFunctions:
             ]
         }
         
-        json_file = temp_workspace / "collection_test.json"
-        with open(json_file, 'w') as f:
-            json.dump(test_data, f)
-        
-        # Test collecting team names
-        result = template_functions.evaluate_all_functions(f"{{{{json_collect:$.teams[*].name:{json_file}}}}}")
-        assert result == "Alpha,Beta"
+        json_file = create_json_file("collection_test.json", test_data)
         
-        # Test collecting project titles
-        result = template_functions.evaluate_all_functions(f"{{{{json_collect:$.projects[*].title:{json_file}}}}}")
-        assert result == "Project X,Project Y,Project Z"
-        
-        # Test collecting nested array values
-        result = template_functions.evaluate_all_functions(f"{{{{json_collect:$.teams[*].members[*]:{json_file}}}}}")
-        assert result == "Alice,Bob,Charlie,Diana,Eve"
+        # Team names, project titles and nested array values in one template
+        result = template_functions.evaluate_all_functions(
+            f"{{{{json_collect:$.teams[*].name:{json_file}}}}}|"
+            f"{{{{json_collect:$.projects[*].title:{json_file}}}}}|"
+            f"{{{{json_collect:$.teams[*].members[*]:{json_file}}}}}"
+        )
+        assert result.split("|") == [
+            "Alpha,Beta",
+            "Project X,Project Y,Project Z",
+            "Alice,Bob,Charlie,Diana,Eve",
+        ]
     
-    def test_json_filtering_functions(self, template_functions, temp_workspace):
+    def test_json_filtering_functions(self, template_functions, create_json_file):
         """Test json_count_where and json_filter functions."""
         test_data = {
             "employees": [
@@ -321,31 +338,26 @@ class TestJSONTemplateFunctions:
             ]
         }
         
-        json_file = temp_workspace / "filtering_test.json"
-        with open(json_file, 'w') as f:
-            json.dump(test_data, f)
-        
-        # Test json_count_where with numeric filter
-        result = template_functions.evaluate_all_functions(f"{{{{json_count_where:$.employees[?salary>60000]:{json_file}}}}}")
-        assert result == "3"  # Alice, Charlie, Eve
+        json_file = create_json_file("filtering_test.json", test_data)
         
-        # Test json_count_where with string filter
-        result = template_functions.evaluate_all_functions(f"{{{{json_count_where:$.employees[?department==Engineering]:{json_file}}}}}")
-        assert result == "3"  # Alice, Charlie, Eve
-        
-        # Test json_filter to get names of high earners
-        result = template_functions.evaluate_all_functions(f"{{{{json_filter:$.employees[?salary>60000].name:{json_file}}}}}")
-        assert result == "Alice,Charlie,Eve"
-        
-        # Test json_filter with string comparison
-        result = template_functions.evaluate_all_functions(f"{{{{json_filter:$.employees[?department==Engineering].name:{json_file}}}}}")
-        assert result == "Alice,Charlie,Eve"
-        
-        # Test multiple filter conditions
-        result = template_functions.evaluate_all_functions(f"{{{{json_count_where:$.employees[?salary<60000]:{json_file}}}}}")
-        assert result == "2"  # Bob, Diana
+        result = template_functions.evaluate_all_functions(
+            # json_count_where with numeric and string filters
+            f"{{{{json_count_where:$.employees[?salary>60000]:{json_file}}}}}|"
+            f"{{{{json_count_where:$.employees[?department==Engineering]:{json_file}}}}}|"
+            # json_filter to get names of high earners, and by string comparison
+            f"{{{{json_filter:$.employees[?salary>60000].name:{json_file}}}}}|"
+            f"{{{{json_filter:$.employees[?department==Engineering].name:{json_file}}}}}|"
+            f"{{{{json_count_where:$.employees[?salary<60000]:{json_file}}}}}"
+        )
+        assert result.split("|") == [
+            "3",  # Alice, Charlie, Eve
+            "3",  # Alice, Charlie, Eve
+            "Alice,Charlie,Eve",
+            "Alice,Charlie,Eve",
+            "2",  # Bob, Diana
+        ]
     
-    def test_json_wildcard_edge_cases(self, template_functions, temp_workspace):
+    def test_json_wildcard_edge_cases(self, template_functions, create_json_file):
         """Test edge cases for wildcard functionality."""
         test_data = {
             "empty_array": [],
@@ -363,23 +375,21 @@ class TestJSONTemplateFunctions:
             }
         }
         
-        json_file = temp_workspace / "wildcard_test.json"
-        with open(json_file, 'w') as f:
-            json.dump(test_data, f)
+        json_file = create_json_file("wildcard_test.json", test_data)
         
-        # Test with empty array
-        result = template_functions.evaluate_all_functions(f"{{{{json_sum:$.empty_array[*].value:{json_file}}}}}")
-        assert result == "0"
-        
-        # Test with mixed data types
-        result = template_functions.evaluate_all_functions(f"{{{{json_sum:$.mixed_data[*].value:{json_file}}}}}")
-        assert result == "30.0"  # 10 + 20 (string that converts to number)
-        
-        # Test deeply nested wildcards
-        result = template_functions.evaluate_all_functions(f"{{{{json_sum:$.nested.level1[*].level2[*].value:{json_file}}}}}")
-        assert result == "6.0"  # 1 + 2 + 3
+        # Empty array, mixed data types and deeply nested wildcards
+        result = template_functions.evaluate_all_functions(
+            f"{{{{json_sum:$.empty_array[*].value:{json_file}}}}}|"
+            f"{{{{json_sum:$.mixed_data[*].value:{json_file}}}}}|"
+            f"{{{{json_sum:$.nested.level1[*].level2[*].value:{json_file}}}}}"
+        )
+        assert result.split("|") == [
+            "0",
+            "30.0",  # 10 + 20 (string that converts to number)
+            "6.0",  # 1 + 2 + 3
+        ]
     
-    def test_json_filter_operators(self, template_functions, temp_workspace):
+    def test_json_filter_operators(self, template_functions, create_json_file):
         """Test different filter operators."""
         test_data = {
             "products": [
@@ -390,25 +400,55 @@ class TestJSONTemplateFunctions:
             ]
         }
         
-        json_file = temp_workspace / "operators_test.json"
-        with open(json_file, 'w') as f:
-            json.dump(test_data, f)
-        
-        # Test >= operator
-        result = template_functions.evaluate_all_functions(f"{{{{json_count_where:$.products[?price>=15]:{json_file}}}}}")
-        assert result == "2"  # Gadget, Super Widget
+        json_file = create_json_file("operators_test.json", test_data)
         
-        # Test <= operator
-        result = template_functions.evaluate_all_functions(f"{{{{json_count_where:$.products[?price<=10.50]:{json_file}}}}}")
-        assert result == "2"  # Widget, Mega Gadget
-        
-        # Test != operator
-        result = template_functions.evaluate_all_functions(f"{{{{json_count_where:$.products[?category!=tools]:{json_file}}}}}")
-        assert result == "2"  # Gadget, Mega Gadget
-        
-        # Test contains operator
-        result = template_functions.evaluate_all_functions(f"{{{{json_filter:$.products[?name contains Widget].name:{json_file}}}}}")
-        assert result == "Widget,Super Widget"
+        # >=, <=, != and contains operators
+        result = template_functions.evaluate_all_functions(
+            f"{{{{json_count_where:$.products[?price>=15]:{json_file}}}}}|"
+            f"{{{{json_count_where:$.products[?price<=10.50]:{json_file}}}}}|"
+            f"{{{{json_count_where:$.products[?category!=tools]:{json_file}}}}}|"
+            f"{{{{json_filter:$.products[?name contains Widget].name:{json_file}}}}}"
+        )
+        assert result.split("|") == [
+            "2",  # Gadget, Super Widget
+            "2",  # Widget, Mega Gadget
+            "2",  # Gadget, Mega Gadget
+            "Widget,Super Widget",
+        ]
+
+
+def _write_users_db(db_file):
+    """Create the users table used by the SQLite tests in a new database file."""
+    conn = sqlite3.connect(str(db_file))
+    try:
+        # Create test table
+        conn.execute("""
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY,
+                name TEXT,
+                age INTEGER,
+                active BOOLEAN
+            )
+        """)
+        
+        # Insert test data
+        test_data = [
+            (1, "John", 25, 1),
+            (2, "Alice", 30, 0),
+            (3, "Bob", 35, 1)
+        ]
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)", test_data)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope="module")
+def sqlite_file(tmp_path_factory):
+    """Create a test SQLite database, shared read-only by the module."""
+    db_file = tmp_path_factory.mktemp("sqlite-data") / "test.db"
+    _write_users_db(db_file)
+    return str(db_file)
 
 
 @pytest.mark.unit
@@ -416,36 +456,6 @@ class TestJSONTemplateFunctions:
 class TestSQLiteTemplateFunctions:
     """Test SQLite extraction functions."""
     
-    @pytest.fixture
-    def sqlite_file(self, temp_workspace):
-        """Create a test SQLite database."""
-        db_file = temp_workspace / "test.db"
-        
-        conn = sqlite3.connect(str(db_file))
-        try:
-            # Create test table
-            conn.execute("""
-                CREATE TABLE users (
-                    id INTEGER PRIMARY KEY,
-                    name TEXT,
-                    age INTEGER,
-                    active BOOLEAN
-                )
-            """)
-            
-            # Insert test data
-            test_data = [
-                (1, "John", 25, 1),
-                (2, "Alice", 30, 0),
-                (3, "Bob", 35, 1)
-            ]
-            conn.executemany("INSERT INTO users VALUES (?, ?, ?, ?)", test_data)
-            conn.commit()
-        finally:
-            conn.close()
-            
-        return str(db_file)
-    
     def test_sqlite_query_function(self, template_functions, sqlite_file):
         """Test {{sqlite_query:SQL:file}} function."""
         # Simple SELECT query
@@ -458,7 +468,7 @@ class TestSQLiteTemplateFunctions:
         
         # Aggregation query
         result = template_functions.evaluate_all_functions(f"{{{{sqlite_query:SELECT AVG(age) FROM users:{sqlite_file}}}}}")
-        assert float(result) == pytest.approx(30.0)
+        assert result == "30.0"
     
     def test_sqlite_value_function(self, template_functions, sqlite_file):
         """Test {{sqlite_value:row:column:file}} function."""
@@ -473,6 +483,54 @@ class TestSQLiteTemplateFunctions:
         result = template_functions.evaluate_all_functions(f"{{{{sqlite_value:2:name:{sqlite_file}}}}}")
         assert result == "Bob"
 
+    def test_sqlite_sees_replaced_database(self, template_functions, temp_workspace):
+        """Test that a reused connection is dropped when the database file is replaced."""
+        sqlite_file = temp_workspace / "test.db"
+        _write_users_db(sqlite_file)
+        template = f"{{{{sqlite_query:SELECT COUNT(*) FROM users:{sqlite_file}}}}}"
+        assert template_functions.evaluate_all_functions(template) == "3"
+
+        replacement = Path(sqlite_file).with_name("replacement.db")
+        conn = sqlite3.connect(str(replacement))
+        try:
+            conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY)")
+            conn.execute("INSERT INTO users VALUES (1)")
+            conn.commit()
+        finally:
+            conn.close()
+        replacement.replace(sqlite_file)
+
+        assert template_functions.evaluate_all_functions(template) == "1"
+
+    def test_sqlite_query_cannot_modify_database(self, template_functions, sqlite_file):
+        """Test that pooled connections are read-only."""
+        with pytest.raises(TemplateFunctionError, match="readonly"):
+            template_functions.evaluate_all_functions(
+                f"{{{{sqlite_query:DELETE FROM users RETURNING id:{sqlite_file}}}}}")
+        assert template_functions.evaluate_all_functions(
+            f"{{{{sqlite_query:SELECT COUNT(*) FROM users:{sqlite_file}}}}}") == "3"
+
+    def test_sqlite_connections_are_bounded_and_closed(self, temp_workspace, monkeypatch):
+        """Test that least recently used connections are closed, and close() closes the rest."""
+        monkeypatch.setattr("template_functions._SQLITE_MAX_CONNECTIONS", 2)
+        tf = TemplateFunctions(str(temp_workspace))
+        for name in ("a", "b", "c"):
+            _write_users_db(temp_workspace / f"{name}.db")
+
+        connections = []
+        for name in ("a", "b", "c"):
+            assert tf.evaluate_all_functions(f"{{{{sqlite_query:SELECT COUNT(*) FROM users:{name}.db}}}}") == "3"
+            connections.append(next(reversed(tf._sqlite_connections.values()))[1])
+        assert [Path(p).name for p in tf._sqlite_connections] == ["b.db", "c.db"]
+        with pytest.raises(sqlite3.ProgrammingError):
+            connections[0].execute("SELECT 1")
+
+        tf.close()
+        assert not tf._sqlite_connections
+        for conn in connections[1:]:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
 
 @pytest.mark.unit
 @pytest.mark.template_functions
@@ -507,13 +565,103 @@ class TestTemplateFunctionEdgeCases:
         with pytest.raises(TemplateFunctionError, match="file_line requires exactly 2 arguments"):
             template_functions.evaluate_all_functions("{{file_line:1}}")
 
+    def test_repeated_template_reads_current_file(self, template_functions, temp_workspace):
+        """Test that a reused (cached) template still evaluates against the current file."""
+        # Written by hand: files from create_text_file are shared and read-only
+        text_file = temp_workspace / "modified.txt"
+        text_file.write_text("Old line")
+        template = f"Before {{{{file_line:1:{text_file}}}}} and {{{{file_line_count:{text_file}}}}} after"
+
+        assert template_functions.evaluate_all_functions(template) == "Before Old line and 1 after"
+
+        text_file.write_text("New line\nSecond line")
+        assert template_functions.evaluate_all_functions(template) == "Before New line and 2 after"
+
+    def test_parallel_evaluation(self, temp_workspace, create_text_file, create_csv_file, monkeypatch):
+        """Test that PICARD_PARALLEL=1 gives the same text and the same first error."""
+        text_file = create_text_file("test.txt", ["Line 1", "Line 2"])
+        csv_file = create_csv_file("test.csv")
+        template = (f"{{{{file_line:2:{text_file}}}}} / {{{{csv_count:name:{csv_file}}}}} / "
+                    f"{{{{csv_column:age:{csv_file}}}}}")
+        failing = f"{{{{file_line:9:{text_file}}}}} {{{{csv_cell:99:0:{csv_file}}}}}"
+        
+        monkeypatch.setenv("PICARD_PARALLEL", "1")
+        tf = TemplateFunctions(str(temp_workspace))
+        assert tf.evaluate_all_functions(template) == "Line 2 / 4 / 25,30,35,28"
+        with pytest.raises(TemplateFunctionError, match="Line number 9 out of range"):
+            tf.evaluate_all_functions(failing)
+    
+    def test_clear_caches(self, temp_workspace):
+        """Test that clear_caches forces a reload even when mtime and size are unchanged."""
+        tf = TemplateFunctions(str(temp_workspace))
+        text_file = temp_workspace / "same_size.txt"
+        text_file.write_text("aaa")
+        stat = text_file.stat()
+        assert tf.evaluate_all_functions(f"{{{{file_line:1:{text_file}}}}}") == "aaa"
+
+        text_file.write_text("bbb")
+        os.utime(text_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        tf.clear_caches()
+        assert tf.evaluate_all_functions(f"{{{{file_line:1:{text_file}}}}}") == "bbb"
+
+    def test_dispatch_honours_overrides_and_patches(self, temp_workspace):
+        """Test that functions dispatch to the instance's methods, not the base class's."""
+        class UpperFileLine(TemplateFunctions):
+            def _file_line(self, args):
+                return super()._file_line(args).upper()
+
+        (temp_workspace / "a.txt").write_text("hello")
+        assert UpperFileLine(str(temp_workspace)).evaluate_function("file_line", ["1", "a.txt"]) == "HELLO"
+
+        tf = TemplateFunctions(str(temp_workspace))
+        with patch.object(tf, "_file_line", return_value="patched"):
+            assert tf.evaluate_all_functions("{{file_line:1:a.txt}}") == "patched"
+
+    def test_file_cache_evicts_least_recently_used(self, temp_workspace, monkeypatch):
+        """Test that the file cache keeps only the most recently used files."""
+        monkeypatch.setattr("template_functions._FILE_CACHE_MAX_ENTRIES", 2)
+        tf = TemplateFunctions(str(temp_workspace))
+        for name in ("a", "b", "c"):
+            (temp_workspace / f"{name}.txt").write_text(name)
+
+        assert tf.evaluate_all_functions("{{file_line:1:a.txt}}{{file_line:1:b.txt}}") == "ab"
+        assert tf.evaluate_all_functions("{{file_line:1:a.txt}}{{file_line:1:c.txt}}") == "ac"
+        assert [Path(p).name for p in tf._file_cache] == ["a.txt", "c.txt"]
+
+    def test_derived_caches_are_bounded(self, temp_workspace, monkeypatch):
+        """Test that derivations of an evicted CSV are dropped and derived caches stay bounded."""
+        monkeypatch.setattr("template_functions._FILE_CACHE_MAX_ENTRIES", 1)
+        monkeypatch.setattr("template_functions._DERIVED_CACHE_MAX_ENTRIES", 3)
+        tf = TemplateFunctions(str(temp_workspace))
+        for name in ("a", "b"):
+            (temp_workspace / f"{name}.csv").write_text("x,y\n1,2\n3,4\n")
+
+        assert tf.evaluate_all_functions("{{csv_sum:x:a.csv}}") == "4.0"
+        assert tf._csv_column_cache
+        assert all(key[0] == "a.csv" for key in tf._csv_column_cache)
+        assert tf.evaluate_all_functions("{{csv_sum:y:b.csv}}") == "6.0"
+        assert all(key[0] == "b.csv" for key in tf._csv_column_cache)
+        assert {key[1] for key in tf._csv_column_cache} == {"headers", "values", "numeric"}
+        assert len(tf._csv_column_cache) <= 3
+
+        for index in range(5):
+            (temp_workspace / f"{index}.txt").write_text("line")
+            tf.evaluate_all_functions(f"{{{{file_line:1:{index}.txt}}}}")
+        assert len(tf._resolved_paths) == 3
+
 
 @pytest.mark.unit
 @pytest.mark.template_functions 
 class TestTargetFileSubstitution:
     """Test TARGET_FILE[component_name] keyword substitution."""
     
-    def test_target_file_component_substitution(self, temp_workspace, create_text_file):
+    @pytest.fixture
+    def tf(self, template_functions):
+        """The shared TemplateFunctions, with its components cleared after each test."""
+        yield template_functions
+        template_functions.reset_components()
+    
+    def test_target_file_component_substitution(self, tf, create_text_file):
         """Test that TARGET_FILE[component_name] is properly substituted."""
         lines = ["First line", "Second line"]
         text_file = create_text_file("test.txt", lines)
@@ -524,9 +672,7 @@ class TestTargetFileSubstitution:
             name="test_comp", 
             target_file=text_file
         )
-        
-        # Create TemplateFunctions with the component
-        tf = TemplateFunctions(str(temp_workspace), components=[component])
+        tf.reset_components([component])
         
         # Test with TARGET_FILE[component_name] keyword
         result = tf.evaluate_all_functions("{{file_line:1:TARGET_FILE[test_comp]}}")
@@ -535,44 +681,44 @@ class TestTargetFileSubstitution:
         result = tf.evaluate_all_functions("{{file_line_count:TARGET_FILE[test_comp]}}")
         assert result == "2"
     
-    def test_target_file_errors(self, temp_workspace):
+    def test_target_file_errors(self, tf):
         """Test TARGET_FILE error cases."""
-        # Create a dummy component for the "component not found" test
+        # Test bare TARGET_FILE (should fail)
+        tf.reset_components([])
+        with pytest.raises(TemplateFunctionError, match="TARGET_FILE requires component name"):
+            tf.evaluate_all_functions("{{file_line:1:TARGET_FILE}}")
+        
+        # Test TARGET_FILE[component] with empty components list
+        with pytest.raises(TemplateFunctionError, match="No components provided"):
+            tf.evaluate_all_functions("{{file_line:1:TARGET_FILE[test]}}")
+        
+        # Test invalid component name when components exist
         dummy_component = ComponentSpec(
             type="create_text",
             name="dummy", 
             target_file="dummy.txt"
         )
-        
-        tf_with_components = TemplateFunctions(str(temp_workspace), components=[dummy_component])
-        tf_empty = TemplateFunctions(str(temp_workspace), components=[])
-        
-        # Test bare TARGET_FILE (should fail)
-        with pytest.raises(TemplateFunctionError, match="TARGET_FILE requires component name"):
-            tf_empty.evaluate_all_functions("{{file_line:1:TARGET_FILE}}")
-        
-        # Test invalid component name when components exist
+        tf.reset_components([dummy_component])
         with pytest.raises(TemplateFunctionError, match="Component 'nonexistent' not found"):
-            tf_with_components.evaluate_all_functions("{{file_line:1:TARGET_FILE[nonexistent]}}")
-        
-        # Test TARGET_FILE[component] with empty components list
-        with pytest.raises(TemplateFunctionError, match="No components provided"):
-            tf_empty.evaluate_all_functions("{{file_line:1:TARGET_FILE[test]}}")
+            tf.evaluate_all_functions("{{file_line:1:TARGET_FILE[nonexistent]}}")
 
 
-@pytest.mark.unit
-@pytest.mark.template_functions
-@pytest.mark.parametrize("template,expected", [
+FILE_FUNCTION_CASES = (
     ("{{file_line:1:FILE}}", "Line 1"),
     ("{{file_word:2:FILE}}", "1"), 
     ("{{file_line_count:FILE}}", "3"),
     ("{{file_word_count:FILE}}", "6"),
-])
-def test_file_functions_parametrized(template_functions, create_text_file, template, expected):
-    """Parametrized tests for file functions."""
+)
+
+
+@pytest.mark.unit
+@pytest.mark.template_functions
+def test_file_functions_batch(template_functions, create_text_file):
+    """Evaluate each file function case against one shared file."""
     lines = ["Line 1", "Line 2", "Line 3"]
     text_file = create_text_file("test.txt", lines)
     
-    template_with_file = template.replace("FILE", text_file)
-    result = template_functions.evaluate_all_functions(template_with_file)
-    assert result == expected
\ No newline at end of file
+    for template, expected in FILE_FUNCTION_CASES:
+        template_with_file = template.replace("FILE", text_file)
+        result = template_functions.evaluate_all_functions(template_with_file)
+        assert result == expected, template
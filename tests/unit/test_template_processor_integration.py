@@ -6,50 +6,54 @@ enhanced variable substitution, template function evaluation, and multi-field pr
 """
 
 import pytest
-import tempfile
-import json
-import sys
-from pathlib import Path
-
-# Add src directory to Python path
-project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / "src"))
+import os
+import re
 
 from template_processor import TemplateProcessor
 from entity_pool import EntityPool
 
 
+_CURRENCY_RE = re.compile(r'\$[\d,]+')
+_DOLLAR_AMOUNT_RE = re.compile(r'\$(\d+)')
+
+# Workspace contents for TestTemplateProcessorIntegrationComplete
+_COMPLETE_QS_PAIRS = ((1, 1), (1, 2), (2, 1), (2, 2), (10, 1), (10, 2))
+_DATA_TXT_TEMPLATE = b"Line 1 for Q%dS%d\nLine 2\nLine 3 special\nLine 4"
+_INFO_CSV = b"name,value,status\nItem1,100,active\nItem2,200,inactive\nItem3,150,pending"
+_CONFIG_JSON_TEMPLATE = b'{"question": %d, "sample": %d, "active": true}'
+
+_LONG_TEMPLATE = "Long template: " + "{{entity1}} " * 1000 + "end"
+
+
+def _qs_id(question_id, sample_number):
+    """Directory name {{qs_id}} expands to for a question/sample pair."""
+    return "q%d_s%d" % (question_id, sample_number)
+
+
+def _assert_no_markers(text):
+    """Assert that no {{...}} placeholder of any kind survived processing."""
+    assert '{{' not in text
+
+
+@pytest.fixture
+def processor(shared_processor):
+    """Shared TemplateProcessor, reset so no cached state carries between tests."""
+    shared_processor.reset_state()
+    yield shared_processor
+
+
+@pytest.fixture(scope="session")
+def processor_no_pool(processor_base_dir):
+    """TemplateProcessor without an entity pool file."""
+    return TemplateProcessor(base_dir=processor_base_dir)
+
+
 class TestTemplateProcessorBasic:
     """Test basic TemplateProcessor functionality."""
     
-    @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
-    
-    @pytest.fixture
-    def entity_pool_file(self, temp_workspace):
-        """Create test entity pool file."""
-        pool_file = temp_workspace / "entity_pool.json"
-        pool_data = {
-            "entity1": ["Alice", "Bob", "Charlie"],
-            "entity2": ["London", "Paris", "Tokyo"],
-            "colors": ["red", "blue", "green"],
-            "metals": ["gold", "silver", "copper"],
-            "gems": ["ruby", "sapphire", "emerald"]
-        }
-        pool_file.write_text(json.dumps(pool_data))
-        return str(pool_file)
-    
-    @pytest.fixture
-    def processor(self, entity_pool_file, temp_workspace):
-        """Create TemplateProcessor instance."""
-        return TemplateProcessor(entity_pool_file=entity_pool_file, base_dir=str(temp_workspace))
-    
-    def test_processor_initialization(self, entity_pool_file, temp_workspace):
+    def test_processor_initialization(self, base_entity_pool_file, processor_base_dir):
         """Test that TemplateProcessor initializes correctly."""
-        processor = TemplateProcessor(entity_pool_file=entity_pool_file, base_dir=str(temp_workspace))
+        processor = TemplateProcessor(entity_pool_file=base_entity_pool_file, base_dir=processor_base_dir)
         
         assert processor.entity_pool is not None
         assert processor.template_functions is not None
@@ -62,24 +66,48 @@ class TestTemplateProcessorBasic:
         result = processor.process_template(template, question_id=1, sample_number=1)
         
         assert result['original_template'] == template
-        assert '{{entity1}}' not in result['substituted']
-        assert '{{entity2}}' not in result['substituted']
+        _assert_no_markers(result['substituted'])
         assert result['has_template_functions'] is False
         assert len(result['template_function_results']) == 0
         
         # Should have entity substitutions
         assert len(result['entities']) > 0 or len(result.get('variables', {})) > 0
     
-    def test_qs_id_substitution(self, processor):
-        """Test {{qs_id}} substitution."""
+    @pytest.mark.parametrize("question_id,sample_number,expected_qs_id", [
+        (1, 1, "q1_s1"),
+        (42, 3, "q42_s3"),
+        (10, 5, "q10_s5"),
+        (999999, 888888, "q999999_s888888"),
+    ])
+    def test_qs_id_substitution(self, processor, question_id, sample_number, expected_qs_id):
+        """Test {{qs_id}} substitution in single and multi-field processing."""
         template = "File: test_artifacts/{{qs_id}}/output.txt"
         
-        result = processor.process_template(template, question_id=42, sample_number=3)
+        result = processor.process_template(template, question_id=question_id, sample_number=sample_number)
         
         assert result['original_template'] == template
-        assert 'q42_s3' in result['substituted']
-        assert '{{qs_id}}' not in result['substituted']
+        assert f"test_artifacts/{expected_qs_id}/output.txt" in result['substituted']
+        _assert_no_markers(result['substituted'])
         assert result['has_template_functions'] is False
+        
+        fields = {
+            'input_file': 'test_artifacts/{{qs_id}}/input.txt',
+            'log_file': 'test_artifacts/{{qs_id}}/process.log'
+        }
+        
+        result = processor.process_multiple_fields(fields, question_id=question_id, sample_number=sample_number)
+        
+        # All fields should have {{qs_id}} replaced
+        for field_name in fields:
+            substituted = result[field_name]['substituted']
+            assert expected_qs_id in substituted
+            _assert_no_markers(substituted)
+        
+        # Check shared information
+        shared = result['_shared']
+        assert shared['qs_id'] == expected_qs_id
+        assert shared['question_id'] == question_id
+        assert shared['sample_number'] == sample_number
     
     def test_enhanced_semantic_variables(self, processor):
         """Test enhanced semantic variable substitution."""
@@ -88,8 +116,7 @@ class TestTemplateProcessorBasic:
         result = processor.process_template(template, question_id=1, sample_number=1)
         
         assert result['original_template'] == template
-        assert '{{semantic1:person_name}}' not in result['substituted']
-        assert '{{semantic2:department}}' not in result['substituted']
+        _assert_no_markers(result['substituted'])
         assert result['has_template_functions'] is False
         
         # Should have enhanced variables
@@ -103,12 +130,11 @@ class TestTemplateProcessorBasic:
         result = processor.process_template(template, question_id=1, sample_number=1)
         
         assert result['original_template'] == template
-        assert '{{number1:30000:80000:currency}}' not in result['substituted']
+        _assert_no_markers(result['substituted'])
         assert result['has_template_functions'] is False
         
         # Should contain a numeric value
-        import re
-        assert re.search(r'\$[\d,]+', result['substituted'])
+        assert _CURRENCY_RE.search(result['substituted'])
         
         # Should have enhanced variables
         variables = result.get('variables', {})
@@ -121,8 +147,7 @@ class TestTemplateProcessorBasic:
         result = processor.process_template(template, question_id=1, sample_number=1)
         
         assert result['original_template'] == template
-        assert '{{entity1:colors}}' not in result['substituted']
-        assert '{{entity2:metals}}' not in result['substituted']
+        _assert_no_markers(result['substituted'])
         assert result['has_template_functions'] is False
         
         # Should contain values from specified pools (fallback to default if pools don't exist)
@@ -139,24 +164,10 @@ class TestTemplateProcessorFunctions:
     """Test TemplateProcessor with template functions."""
     
     @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
-    
-    @pytest.fixture
-    def entity_pool_file(self, temp_workspace):
-        """Create test entity pool file."""
-        pool_file = temp_workspace / "entity_pool.json"
-        pool_data = {"entity1": ["Alice", "Bob"], "entity2": ["file1", "file2"]}
-        pool_file.write_text(json.dumps(pool_data))
-        return str(pool_file)
-    
-    @pytest.fixture
-    def test_files(self, temp_workspace):
+    def test_files(self, processor_workspace):
         """Create test files for template functions."""
         # Create test directory structure
-        test_dir = temp_workspace / "q1_s1"
+        test_dir = processor_workspace / "q1_s1"
         test_dir.mkdir(parents=True, exist_ok=True)
         
         # Create test text file
@@ -173,11 +184,6 @@ class TestTemplateProcessorFunctions:
             'csv_file': csv_file
         }
     
-    @pytest.fixture
-    def processor(self, entity_pool_file, temp_workspace):
-        """Create TemplateProcessor instance."""
-        return TemplateProcessor(entity_pool_file=entity_pool_file, base_dir=str(temp_workspace))
-    
     def test_file_line_template_function(self, processor, test_files):
         """Test file_line template function."""
         template = "Line 3 says: {{file_line:3:{{qs_id}}/test_data.txt}}"
@@ -187,7 +193,7 @@ class TestTemplateProcessorFunctions:
         assert result['original_template'] == template
         assert result['has_template_functions'] is True
         assert 'Third line content' in result['substituted']
-        assert '{{file_line:' not in result['substituted']
+        _assert_no_markers(result['substituted'])
         
         # Check template function results
         assert len(result['template_function_results']) > 0
@@ -203,7 +209,7 @@ class TestTemplateProcessorFunctions:
         assert result['original_template'] == template
         assert result['has_template_functions'] is True
         assert 'Alice' in result['substituted']  # Should get Alice from row 1
-        assert '{{csv_value:' not in result['substituted']
+        _assert_no_markers(result['substituted'])
         
         # Check template function results
         assert len(result['template_function_results']) > 0
@@ -218,14 +224,26 @@ class TestTemplateProcessorFunctions:
         
         assert result['original_template'] == template
         assert result['has_template_functions'] is True
-        assert '{{entity1}}' not in result['substituted']
-        assert '{{csv_value:' not in result['substituted']
+        _assert_no_markers(result['substituted'])
         assert '50000' in result['substituted']  # John's salary from CSV
         
         # Should have both entity and template function results
         assert len(result['entities']) > 0 or len(result.get('variables', {})) > 0
         assert len(result['template_function_results']) > 0
     
+    def test_reset_state_keeps_entity_pool(self, processor, test_files):
+        """Test that reset_state clears cached files but keeps the loaded pool."""
+        entity_pool = processor.entity_pool
+        processor.process_template("{{file_line:1:{{qs_id}}/test_data.txt}}", question_id=1, sample_number=1)
+        assert processor.template_functions._file_cache
+        
+        processor.reset_state()
+        
+        assert not processor.template_functions._file_cache
+        assert processor.entity_pool is entity_pool
+        result = processor.process_template("{{file_line:1:{{qs_id}}/test_data.txt}}", question_id=1, sample_number=1)
+        assert result['substituted'] == 'First line'
+    
     def test_template_function_error_handling(self, processor):
         """Test error handling for invalid template functions."""
         template = "Invalid function: {{invalid_function:arg1:arg2}}"
@@ -263,28 +281,6 @@ class TestTemplateProcessorFunctions:
 class TestTemplateProcessorMultiField:
     """Test TemplateProcessor multi-field functionality."""
     
-    @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
-    
-    @pytest.fixture
-    def entity_pool_file(self, temp_workspace):
-        """Create test entity pool file."""
-        pool_file = temp_workspace / "entity_pool.json"
-        pool_data = {
-            "entity1": ["Alice", "Bob", "Charlie"],
-            "entity2": ["task1", "task2", "task3"]
-        }
-        pool_file.write_text(json.dumps(pool_data))
-        return str(pool_file)
-    
-    @pytest.fixture
-    def processor(self, entity_pool_file, temp_workspace):
-        """Create TemplateProcessor instance."""
-        return TemplateProcessor(entity_pool_file=entity_pool_file, base_dir=str(temp_workspace))
-    
     def test_multi_field_consistent_variables(self, processor):
         """Test that multi-field processing maintains consistent variable values."""
         fields = {
@@ -314,7 +310,6 @@ class TestTemplateProcessorMultiField:
         
         # Variables should be consistent across fields
         # If entity1 is "Alice" in prompt, it should be "Alice" everywhere
-        import re
         entity1_values = set()
         entity2_values = set()
         
@@ -324,9 +319,7 @@ class TestTemplateProcessorMultiField:
             substituted = field_result['substituted']
             
             # This is a basic consistency check - values should not contain template markers
-            assert '{{entity1}}' not in substituted
-            assert '{{entity2}}' not in substituted
-            assert '{{qs_id}}' not in substituted
+            _assert_no_markers(substituted)
         
         # Check that all fields have the same shared variables
         if shared.get('entities'):
@@ -353,10 +346,9 @@ class TestTemplateProcessorMultiField:
         field3_text = result['field3']['substituted']
         
         # Extract the numeric value from each field
-        import re
-        amounts1 = re.findall(r'\$(\d+)', field1_text)
-        amounts2 = re.findall(r'\$(\d+)', field2_text)
-        amounts3 = re.findall(r'\$(\d+)', field3_text)
+        amounts1 = _DOLLAR_AMOUNT_RE.findall(field1_text)
+        amounts2 = _DOLLAR_AMOUNT_RE.findall(field2_text)
+        amounts3 = _DOLLAR_AMOUNT_RE.findall(field3_text)
         
         # Same variable should produce same value
         if amounts1 and amounts2 and amounts3:
@@ -366,30 +358,6 @@ class TestTemplateProcessorMultiField:
         shared_vars = result['_shared'].get('variables', {})
         assert len(shared_vars) > 0  # Should have enhanced variables recorded
     
-    def test_multi_field_with_qs_id(self, processor):
-        """Test multi-field processing with {{qs_id}} substitution."""
-        fields = {
-            'input_file': 'test_artifacts/{{qs_id}}/input.txt',
-            'output_file': 'test_artifacts/{{qs_id}}/output.txt',
-            'log_file': 'test_artifacts/{{qs_id}}/process.log'
-        }
-        
-        result = processor.process_multiple_fields(fields, question_id=10, sample_number=5)
-        
-        expected_qs_id = 'q10_s5'
-        
-        # All fields should have {{qs_id}} replaced
-        for field_name in fields.keys():
-            substituted = result[field_name]['substituted']
-            assert expected_qs_id in substituted
-            assert '{{qs_id}}' not in substituted
-        
-        # Check shared information
-        shared = result['_shared']
-        assert shared['qs_id'] == expected_qs_id
-        assert shared['question_id'] == 10
-        assert shared['sample_number'] == 5
-    
     def test_multi_field_empty_fields(self, processor):
         """Test multi-field processing with empty fields."""
         fields = {
@@ -409,7 +377,7 @@ class TestTemplateProcessorMultiField:
         assert result['whitespace_field']['original_template'] == '   '
         
         # Normal field should process correctly
-        assert '{{entity1}}' not in result['normal_field']['substituted']
+        _assert_no_markers(result['normal_field']['substituted'])
         
         # Shared information should still be present
         assert '_shared' in result
@@ -420,22 +388,11 @@ class TestTemplateProcessorEdgeCases:
     """Test TemplateProcessor edge cases and error conditions."""
     
     @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
-    
-    @pytest.fixture
-    def processor_no_pool(self, temp_workspace):
-        """Create TemplateProcessor without entity pool file."""
-        return TemplateProcessor(base_dir=str(temp_workspace))
-    
-    @pytest.fixture
-    def processor_empty_pool(self, temp_workspace):
+    def processor_empty_pool(self, processor_workspace, processor_base_dir):
         """Create TemplateProcessor with empty entity pool."""
-        empty_pool_file = temp_workspace / "empty_pool.json"
+        empty_pool_file = processor_workspace / "empty_pool.json"
         empty_pool_file.write_text("{}")
-        return TemplateProcessor(entity_pool_file=str(empty_pool_file), base_dir=str(temp_workspace))
+        return TemplateProcessor(entity_pool_file=str(empty_pool_file), base_dir=processor_base_dir)
     
     def test_empty_template(self, processor_no_pool):
         """Test processing empty template."""
@@ -482,11 +439,9 @@ class TestTemplateProcessorEdgeCases:
     
     def test_extremely_long_template(self, processor_no_pool):
         """Test processing extremely long template."""
-        long_template = "Long template: " + "{{entity1}} " * 1000 + "end"
-        
-        result = processor_no_pool.process_template(long_template, question_id=1, sample_number=1)
+        result = processor_no_pool.process_template(_LONG_TEMPLATE, question_id=1, sample_number=1)
         
-        assert result['original_template'] == long_template
+        assert result['original_template'] == _LONG_TEMPLATE
         assert result['substituted'] is not None
         assert len(result['substituted']) > 0
         assert result['has_template_functions'] is False
@@ -503,16 +458,6 @@ class TestTemplateProcessorEdgeCases:
         assert '🎉' in result['substituted']
         assert 'Москва' in result['substituted']
     
-    def test_large_question_ids(self, processor_no_pool):
-        """Test processing with large question IDs and sample numbers."""
-        template = "File: {{qs_id}}/output.txt"
-        
-        result = processor_no_pool.process_template(template, question_id=999999, sample_number=888888)
-        
-        assert result['original_template'] == template
-        assert 'q999999_s888888' in result['substituted']
-        assert '{{qs_id}}' not in result['substituted']
-    
     def test_multi_field_edge_cases(self, processor_no_pool):
         """Test multi-field processing edge cases."""
         fields = {}  # Empty fields dict
@@ -534,47 +479,24 @@ class TestTemplateProcessorIntegrationComplete:
     """Complete integration tests covering the full template processing pipeline."""
     
     @pytest.fixture
-    def temp_workspace(self):
-        """Create temporary workspace for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            yield Path(temp_dir)
-    
-    @pytest.fixture
-    def complete_entity_pool_file(self, temp_workspace):
-        """Create comprehensive entity pool file."""
-        pool_file = temp_workspace / "complete_pool.json"
-        pool_data = {
-            "entity1": ["Alice", "Bob", "Charlie", "Diana"],
-            "entity2": ["project1", "project2", "analysis", "report"],
-            "colors": ["red", "blue", "green", "yellow"],
-            "departments": ["engineering", "marketing", "sales", "hr"],
-            "locations": ["headquarters", "branch_office", "remote", "datacenter"]
-        }
-        pool_file.write_text(json.dumps(pool_data))
-        return str(pool_file)
-    
-    @pytest.fixture
-    def complete_test_files(self, temp_workspace):
+    def complete_test_files(self, processor_base_dir):
         """Create comprehensive test files."""
-        # Create multiple question/sample directories
-        for q_id in [1, 2, 10]:
-            for s_num in [1, 2]:
-                test_dir = temp_workspace / f"q{q_id}_s{s_num}"
-                test_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Create various test files
-                (test_dir / "data.txt").write_text(f"Line 1 for Q{q_id}S{s_num}\nLine 2\nLine 3 special\nLine 4")
-                (test_dir / "info.csv").write_text("name,value,status\nItem1,100,active\nItem2,200,inactive\nItem3,150,pending")
-                (test_dir / "config.json").write_text(f'{{"question": {q_id}, "sample": {s_num}, "active": true}}')
-        
-        return temp_workspace
-    
-    @pytest.fixture
-    def complete_processor(self, complete_entity_pool_file, temp_workspace):
-        """Create comprehensive TemplateProcessor instance."""
-        return TemplateProcessor(entity_pool_file=complete_entity_pool_file, base_dir=str(temp_workspace))
+        # One directory per question/sample pair, each with the same three files
+        for q_id, s_num in _COMPLETE_QS_PAIRS:
+            test_dir = os.path.join(processor_base_dir, _qs_id(q_id, s_num))
+            os.makedirs(test_dir, exist_ok=True)
+            
+            for file_name, content in (
+                ("data.txt", _DATA_TXT_TEMPLATE % (q_id, s_num)),
+                ("info.csv", _INFO_CSV),
+                ("config.json", _CONFIG_JSON_TEMPLATE % (q_id, s_num)),
+            ):
+                with open(os.path.join(test_dir, file_name), 'wb') as f:
+                    f.write(content)
+        
+        return processor_base_dir
     
-    def test_complete_pipeline_single_template(self, complete_processor, complete_test_files):
+    def test_complete_pipeline_single_template(self, processor, complete_test_files):
         """Test complete pipeline with single complex template."""
         complex_template = """Employee {{semantic1:person_name}} from {{entity2}} department
 working on {{entity1}} project in {{entity2}} location.
@@ -583,7 +505,7 @@ Project file: {{file_line:1:{{qs_id}}/data.txt}}
 Status: {{csv_value:0:status:{{qs_id}}/info.csv}}
 Enhanced entity: {{entity1}} theme"""
         
-        result = complete_processor.process_template(complex_template, question_id=1, sample_number=1)
+        result = processor.process_template(complex_template, question_id=1, sample_number=1)
         
         # Basic structure checks
         assert result['original_template'] == complex_template
@@ -592,13 +514,7 @@ Enhanced entity: {{entity1}} theme"""
         
         # No template markers should remain
         substituted = result['substituted']
-        assert '{{entity1}}' not in substituted
-        assert '{{entity2}}' not in substituted
-        assert '{{semantic1:person_name}}' not in substituted
-        assert '{{number1:50000:200000:currency}}' not in substituted
-        assert '{{qs_id}}' not in substituted
-        assert '{{file_line:' not in substituted
-        assert '{{csv_value:' not in substituted
+        _assert_no_markers(substituted)
         
         # Expected content should be present
         assert 'Line 1 for Q1S1' in substituted  # From file_line function
@@ -614,7 +530,7 @@ Enhanced entity: {{entity1}} theme"""
         # Variable information should be present
         assert len(result.get('variables', {})) > 0 or len(result['entities']) > 0
     
-    def test_complete_pipeline_multi_field(self, complete_processor, complete_test_files):
+    def test_complete_pipeline_multi_field(self, processor, complete_test_files):
         """Test complete pipeline with multi-field processing."""
         complex_fields = {
             'user_prompt': 'Create report for {{semantic1:person_name}} in {{entity1}}',
@@ -624,7 +540,7 @@ Enhanced entity: {{entity1}} theme"""
             'data_validation': 'Status should be {{csv_value:1:status:{{qs_id}}/info.csv}} for item {{csv_value:1:name:{{qs_id}}/info.csv}}'
         }
         
-        result = complete_processor.process_multiple_fields(complex_fields, question_id=2, sample_number=1)
+        result = processor.process_multiple_fields(complex_fields, question_id=2, sample_number=1)
         
         # All fields should be processed
         for field_name in complex_fields.keys():
@@ -633,12 +549,7 @@ Enhanced entity: {{entity1}} theme"""
             
             # No template markers should remain
             substituted = field_result['substituted']
-            assert '{{semantic1:person_name}}' not in substituted
-            assert '{{entity1:departments}}' not in substituted
-            assert '{{number1:' not in substituted
-            assert '{{qs_id}}' not in substituted
-            assert '{{file_line:' not in substituted
-            assert '{{csv_value:' not in substituted
+            _assert_no_markers(substituted)
         
         # Consistency checks across fields
         user_prompt = result['user_prompt']['substituted']
@@ -662,14 +573,14 @@ Enhanced entity: {{entity1}} theme"""
         assert shared['qs_id'] == 'q2_s1'
         assert len(shared.get('variables', {})) > 0 or len(shared.get('entities', {})) > 0
     
-    def test_error_recovery_in_complete_pipeline(self, complete_processor, complete_test_files):
+    def test_error_recovery_in_complete_pipeline(self, processor, complete_test_files):
         """Test error recovery with mixed valid and invalid operations."""
         mixed_template = """Valid: {{entity1}} works on {{semantic1:person_name}} project
 Invalid file: {{file_line:10:{{qs_id}}/missing.txt}}
 Invalid CSV: {{csv_value:99:nonexistent:{{qs_id}}/missing.csv}}  
 Valid again: Budget ${{number1:1000:5000}} for {{entity2}}"""
         
-        result = complete_processor.process_template(mixed_template, question_id=1, sample_number=1)
+        result = processor.process_template(mixed_template, question_id=1, sample_number=1)
         
         # Should complete despite errors
         assert result['original_template'] == mixed_template
@@ -22,22 +22,28 @@ sys.path.insert(0, str(project_root / "src"))
 from test_runner import TestRunner
 
 
+@pytest.fixture(scope="module")
+def default_runner():
+    """TestRunner with the default base directory, built once for read-only tests."""
+    with patch('test_runner.SandboxManager'), \
+         patch('test_runner.TemplateProcessor'):
+        return TestRunner()
+
+
 class TestTestRunnerInitialization:
     """Test TestRunner initialization and setup."""
     
-    def test_initialization_default_base_dir(self):
+    def test_initialization_default_base_dir(self, default_runner):
         """Test TestRunner initializes with default base directory."""
-        with patch('test_runner.SandboxManager'), \
-             patch('test_runner.TemplateProcessor'):
-            runner = TestRunner()
-            
-            assert runner.base_dir is not None
-            assert runner.results_dir.name == "results"
-            assert runner.config_dir.name == "config"
-            assert runner.test_id is None
-            assert runner.test_dir is None
-            assert runner.responses_file is None
-            assert runner.conversations_dir is None
+        runner = default_runner
+        
+        assert runner.base_dir is not None
+        assert runner.results_dir.name == "results"
+        assert runner.config_dir.name == "config"
+        assert runner.test_id is None
+        assert runner.test_dir is None
+        assert runner.responses_file is None
+        assert runner.conversations_dir is None
     
     def test_initialization_custom_base_dir(self, tmp_path):
         """Test TestRunner initializes with custom base directory."""
@@ -66,11 +72,9 @@ class TestLabelSanitization:
     """Test label sanitization functionality."""
     
     @pytest.fixture
-    def runner(self):
-        """Create TestRunner instance for testing."""
-        with patch('test_runner.SandboxManager'), \
-             patch('test_runner.TemplateProcessor'):
-            return TestRunner()
+    def runner(self, default_runner):
+        """TestRunner instance for testing; sanitize_label keeps no state."""
+        return default_runner
     
     def test_basic_label_sanitization(self, runner):
         """Test basic label sanitization."""
@@ -135,6 +139,11 @@ class TestLabelSanitization:
         """Test that numbers are preserved."""
         result = runner.sanitize_label("test123_run456")
         assert result == "test123_run456"
+    
+    def test_sanitize_label_is_static_and_cached(self, runner):
+        """Test that sanitize_label works without an instance and caches results."""
+        assert TestRunner.sanitize_label("Cached Run") == runner.sanitize_label("Cached Run")
+        assert TestRunner.sanitize_label.cache_info().hits > 0
 
 
 class TestTestRunInitialization:
@@ -201,10 +210,10 @@ class TestTestRunInitialization:
     def test_unique_test_ids_generated(self, runner):
         """Test that multiple initializations generate unique test IDs."""
         with patch('test_runner.PrecheckGenerator'):
-            # Mock datetime to return different timestamps
-            with patch('test_runner.datetime') as mock_datetime:
+            # Mock time to return different timestamps
+            with patch('test_runner.time') as mock_time:
                 # First call returns one timestamp
-                mock_datetime.now.return_value.strftime.return_value = "20250822_120000"
+                mock_time.strftime.return_value = "20250822_120000"
                 test_id1 = runner.initialize_test_run(label="test")
                 
                 # Reset for second run
@@ -213,7 +222,7 @@ class TestTestRunInitialization:
                 runner.precheck_generator = None
                 
                 # Second call returns different timestamp
-                mock_datetime.now.return_value.strftime.return_value = "20250822_120001"
+                mock_time.strftime.return_value = "20250822_120001"
                 test_id2 = runner.initialize_test_run(label="test")
                 
                 assert test_id1 != test_id2
@@ -283,14 +292,36 @@ class TestProgressiveWriting:
         runner._write_result_immediately(response_entry, conversation_entry)
         
         # Verify JSONL entry was written
-        runner.responses_file.close()  # Close to flush
+        runner.responses_file.close()
         responses_file = runner.test_dir / "responses.jsonl"
         content = responses_file.read_text()
         
-        assert '{"question_id": 101' in content
-        assert '"response_text": "Test response"' in content
+        assert json.loads(content) == response_entry
         assert content.endswith('\n')  # JSONL format
-    
+
+    def test_write_result_immediately_keeps_nan_response(self, runner):
+        """Test that non-finite floats are written as NaN/Infinity, not null."""
+        runner._initialize_progressive_writers()
+
+        response_entry = {
+            'question_id': 104,
+            'sample_number': 1,
+            'response_text': 'café',
+            'score': float('nan'),
+            'limit': float('inf')
+        }
+        conversation_entry = {'question_id': 104, 'sample_number': 1}
+
+        runner._write_result_immediately(response_entry, conversation_entry)
+        runner.responses_file.close()
+
+        content = (runner.test_dir / "responses.jsonl").read_text()
+        assert content == json.dumps(response_entry) + '\n'
+
+        loaded = json.loads(content)
+        assert loaded['score'] != loaded['score']  # NaN survives the round trip
+        assert loaded['limit'] == float('inf')
+
     def test_write_result_immediately_creates_conversation_file(self, runner):
         """Test that individual conversation files are created."""
         runner._initialize_progressive_writers()
@@ -323,7 +354,7 @@ class TestProgressiveWriting:
         # Cleanup
         runner.responses_file.close()
     
-    def test_write_result_immediately_handles_file_errors(self, runner, capfd):
+    def test_write_result_immediately_handles_file_errors(self, runner, capsys):
         """Test that file write errors don't crash the test run."""
         runner._initialize_progressive_writers()
         
@@ -337,8 +368,49 @@ class TestProgressiveWriting:
         runner._write_result_immediately(response_entry, conversation_entry)
         
         # Check that warning was printed
-        captured = capfd.readouterr()
-        assert "Failed to write response to JSONL" in captured.out or "Failed to write response to JSONL" in captured.err
+        assert "Failed to write response to JSONL" in capsys.readouterr().out
+    
+    def test_repeated_write_failures_are_throttled(self, runner, capsys):
+        """Test that a run where every write fails prints 1 in 100 failures."""
+        runner._initialize_progressive_writers()
+        runner.responses_file.close()
+        
+        for _ in range(101):
+            runner._write_result_immediately(
+                {'question_id': 1, 'sample_number': 1},
+                {'question_id': 1, 'sample_number': 1}
+            )
+        
+        assert capsys.readouterr().out.count("Failed to write response to JSONL") == 2
+        
+        # Counters are per kind, so the first conversation failure is still printed
+        runner._write_result_immediately({'question_id': 1, 'sample_number': 1}, {})
+        assert capsys.readouterr().out.count("Failed to write conversation file") == 1
+        
+        # A new run starts counting again
+        runner._initialize_progressive_writers()
+        runner.responses_file.close()
+        runner._write_result_immediately(
+            {'question_id': 1, 'sample_number': 1},
+            {'question_id': 1, 'sample_number': 1}
+        )
+        assert capsys.readouterr().out.count("Failed to write response to JSONL") == 1
+    
+    def test_finalize_reports_write_failure_totals(self, runner, capsys):
+        """Test that finalizing a run prints how many writes failed."""
+        runner._initialize_progressive_writers()
+        runner.responses_file.close()
+        
+        for _ in range(5):
+            runner._write_result_immediately(
+                {'question_id': 1, 'sample_number': 1},
+                {'question_id': 1, 'sample_number': 1}
+            )
+        
+        with patch.object(runner, '_generate_test_summary'):
+            runner._finalize_progressive_results()
+        
+        assert "5 response write(s) failed during this run" in capsys.readouterr().out
     
     def test_finalize_progressive_results_closes_files(self, runner):
         """Test that progressive writing finalization closes file handles."""
@@ -350,6 +422,21 @@ class TestProgressiveWriting:
         
         # Verify file handle was closed
         assert runner.responses_file is None
+    
+    def test_each_response_is_on_disk_immediately(self, runner):
+        """Test that every JSONL line is on disk as soon as its result is written."""
+        runner._initialize_progressive_writers()
+        responses_file = runner.test_dir / "responses.jsonl"
+        
+        for question_id in (1, 2, 3):
+            runner._write_result_immediately(
+                {'question_id': question_id, 'sample_number': 1},
+                {'question_id': question_id, 'sample_number': 1}
+            )
+            lines = responses_file.read_text().splitlines()
+            assert [json.loads(line)['question_id'] for line in lines] == list(range(1, question_id + 1))
+        
+        runner.responses_file.close()
 
 
 class TestSandboxSetup:
@@ -426,6 +513,30 @@ class TestSandboxSetup:
         assert call_args[0][1] == 2  # question_id
         assert call_args[0][2] == 1  # sample_number
     
+    def test_setup_question_sandbox_reuses_generator(self, runner):
+        """Test that one file generator is created per sandbox setup type."""
+        runner.template_processor.process_multiple_fields.return_value = {
+            'target_file': {'substituted': 'data.csv'},
+            'content': {'substituted': '{}'},
+            'clutter': {'substituted': '{}'}
+        }
+        
+        mock_generator = Mock()
+        mock_generator.generate.return_value = {'files_created': [], 'content_generated': {}}
+        
+        with patch('test_runner.FileGeneratorFactory') as mock_factory:
+            mock_factory.create_generator.return_value = mock_generator
+            
+            for sample_number in (1, 2):
+                runner._setup_question_sandbox({
+                    'question_id': 1,
+                    'sample_number': sample_number,
+                    'sandbox_setup': {'type': 'create_csv', 'target_file': 'data.csv'}
+                })
+        
+        mock_factory.create_generator.assert_called_once_with('create_csv', str(runner.base_dir))
+        assert mock_generator.generate.call_count == 2
+    
     def test_setup_question_sandbox_error_handling(self, runner, capfd):
         """Test error handling when sandbox setup fails."""
         precheck_entry = {
@@ -555,6 +666,16 @@ class TestTestSummaryGeneration:
         assert 'precheck' in summary_data['files_generated']
         assert 'responses' in summary_data['files_generated']
     
+    def test_generate_test_summary_reuses_statistics(self, runner):
+        """Test that statistics computed earlier in the run are not recomputed."""
+        stats = runner._precheck_statistics()
+        
+        runner._generate_test_summary()
+        
+        summary_data = json.loads((runner.test_dir / 'test_summary.json').read_text())
+        assert summary_data['statistics'] == stats
+        runner.precheck_generator.get_statistics.assert_called_once()
+    
     def test_generate_test_summary_handles_missing_precheck_generator(self, runner):
         """Test summary generation when precheck generator is None."""
         runner.precheck_generator = None